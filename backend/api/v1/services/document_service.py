@@ -12,6 +12,7 @@ from uuid import UUID, uuid4
 import magic
 import sqlite3
 import json
+import threading
 from contextlib import contextmanager
 
 from ..models.document import (
@@ -32,6 +33,8 @@ class DocumentService:
         self.upload_dir = Path(upload_dir)
         self.upload_dir.mkdir(parents=True, exist_ok=True)
         self.db_path = db_path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.RLock()
         self._init_database()
         
         # File type validation
@@ -127,19 +130,37 @@ class DocumentService:
                 ON documents(batch_id)
             """)
     
-    @contextmanager
-    def _get_db(self):
-        """Get database connection context manager"""
-        conn = sqlite3.connect(self.db_path)
+    def _connect(self) -> sqlite3.Connection:
+        """Open the shared database connection in WAL mode"""
+        conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
         conn.row_factory = sqlite3.Row
-        try:
-            yield conn
-            conn.commit()
-        except Exception:
-            conn.rollback()
-            raise
-        finally:
-            conn.close()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        return conn
+    
+    @contextmanager
+    def _get_db(self, write: bool = True):
+        """Get the shared database connection wrapped in a transaction"""
+        with self._db_lock:
+            if self._conn is None:
+                self._conn = self._connect()
+            conn = self._conn
+            # Writers take the write lock up front; reads use a deferred transaction
+            conn.execute("BEGIN IMMEDIATE" if write else "BEGIN")
+            try:
+                yield conn
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+    
+    def close(self):
+        """Close the shared database connection"""
+        with self._db_lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
     
     def validate_file_type(self, content: bytes, document_type: DocumentType) -> tuple[bool, str]:
         """Validate file type using magic bytes"""
@@ -163,6 +184,18 @@ class DocumentService:
             return False, f"File too large. Maximum size for {document_type} is {max_size / (1024*1024):.1f}MB"
         return True, ""
     
+    def validate_upload(self, content: bytes, document_type: DocumentType) -> None:
+        """Check type and size before any IO; raises ValueError"""
+        if document_type not in self.allowed_mime_types:
+            raise ValueError(f"Unsupported document type: {document_type}")
+        
+        file_size = len(content)
+        if file_size > self.max_file_sizes.get(document_type, 0):
+            raise ValueError(
+                f"File size ({file_size} bytes) exceeds maximum "
+                f"({self.max_file_sizes[document_type]} bytes) for {document_type}"
+            )
+    
     def calculate_checksum(self, content: bytes) -> str:
         """Calculate SHA-256 checksum of file content"""
         return hashlib.sha256(content).hexdigest()
@@ -196,7 +229,7 @@ class DocumentService:
         checksum = self.calculate_checksum(content)
         
         # Check for duplicate uploads
-        with self._get_db() as conn:
+        with self._get_db(write=False) as conn:
             existing = conn.execute(
                 "SELECT document_id FROM documents WHERE checksum = ?",
                 (checksum,)
@@ -242,7 +275,7 @@ class DocumentService:
     
     def get_document_status(self, document_id: UUID) -> Optional[DocumentProcessingStatus]:
         """Get document processing status"""
-        with self._get_db() as conn:
+        with self._get_db(write=False) as conn:
             row = conn.execute(
                 """
                 SELECT document_id, status, started_at, completed_at, error_message
@@ -290,7 +323,7 @@ class DocumentService:
         """List uploaded documents with pagination"""
         offset = (page - 1) * page_size
         
-        with self._get_db() as conn:
+        with self._get_db(write=False) as conn:
             # Build query
             query = "SELECT * FROM documents"
             params = []
@@ -357,7 +390,7 @@ class DocumentService:
     
     def get_document_metadata(self, document_id: UUID) -> Optional[DocumentMetadata]:
         """Get document metadata"""
-        with self._get_db() as conn:
+        with self._get_db(write=False) as conn:
             row = conn.execute(
                 "SELECT * FROM documents WHERE document_id = ?",
                 (str(document_id),)
@@ -380,7 +413,7 @@ class DocumentService:
     
     def get_extracted_text(self, document_id: UUID) -> Optional[ExtractedText]:
         """Get extracted text for a document"""
-        with self._get_db() as conn:
+        with self._get_db(write=False) as conn:
             row = conn.execute(
                 """
                 SELECT document_id, extracted_text, extraction_method, 
@@ -502,17 +535,9 @@ class DocumentService:
                           batch_id: Optional[UUID] = None) -> DocumentUploadResponse:
         """Save a document to storage with optional batch association"""
         try:
-            # Validate file type
-            if document_type not in self.allowed_mime_types:
-                raise ValueError(f"Unsupported document type: {document_type}")
-            
-            # Check file size
+            # Validate type and size before touching disk
+            self.validate_upload(content, document_type)
             file_size = len(content)
-            if file_size > self.max_file_sizes.get(document_type, 0):
-                raise ValueError(
-                    f"File size ({file_size} bytes) exceeds maximum "
-                    f"({self.max_file_sizes[document_type]} bytes) for {document_type}"
-                )
             
             # Detect MIME type
             mime = magic.Magic(mime=True)
@@ -665,7 +690,7 @@ class DocumentService:
         from ..models.document_batch import BatchResultsSummary, BatchUploadStatus
         
         try:
-            with self._get_db() as conn:
+            with self._get_db(write=False) as conn:
                 # Get batch info
                 batch = conn.execute("""
                     SELECT * FROM document_batches WHERE batch_id = ?
@@ -733,7 +758,7 @@ class DocumentService:
         
         try:
             # Get batch documents
-            with self._get_db() as conn:
+            with self._get_db(write=False) as conn:
                 query = """
                     SELECT * FROM documents 
                     WHERE batch_id = ?
@@ -831,4 +856,4 @@ class DocumentService:
             
         except Exception as e:
             logger.error(f"Error exporting batch results: {e}")
-            return None
\ No newline at end of file
+            return None
\ No newline at end of file
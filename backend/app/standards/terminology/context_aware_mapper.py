@@ -2,6 +2,9 @@
 
 import logging
 import re
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from typing import Dict, List, Optional, Any, Union, Tuple
 from dataclasses import dataclass
 from enum import Enum
@@ -44,7 +47,99 @@ class ContextModifier(Enum):
     ACUTE = "acute"
 
 
-@dataclass
+def _fuse_patterns(patterns):
+    """Compile a sequence of case-insensitive patterns into one alternation.
+    
+    Searching the alternation is equivalent to searching each pattern in turn;
+    counting its matches equals summing the separate counts only when matches
+    of different patterns can't overlap.
+    """
+    return re.compile('|'.join(f'(?:{pattern})' for pattern in patterns), re.IGNORECASE)
+
+
+# Context modifier patterns, compiled once at import time; each class is one
+# alternation so detecting it is a single search
+NEGATION_PATTERNS = _fuse_patterns([
+    r'\b(?:no|not|without|absent|negative|denies?|rules?\s+out)\b',
+    r'\b(?:never|none|nowhere|nothing|nobody)\b',
+    r'\b(?:cannot|can\'t|won\'t|wouldn\'t|shouldn\'t)\b'
+])
+
+UNCERTAINTY_PATTERNS = _fuse_patterns([
+    r'\b(?:possible|possibly|probable|probably|likely|unlikely)\b',
+    r'\b(?:suspect|suspected|consider|considering|rule\s+out)\b',
+    r'\b(?:may|might|could|would|should)\b',
+    r'\b(?:appears?|seems?|suggests?|consistent\s+with)\b'
+])
+
+TEMPORAL_PATTERNS = {
+    ContextModifier.PAST_HISTORY: _fuse_patterns([
+        r'\b(?:history\s+of|h/o|hx\s+of|previous|prior|past)\b',
+        r'\b(?:formerly|previously|once|used\s+to)\b'
+    ]),
+    ContextModifier.CURRENT: _fuse_patterns([
+        r'\b(?:current|currently|present|active|ongoing)\b',
+        r'\b(?:now|today|recently|acute)\b'
+    ]),
+    ContextModifier.CHRONIC: _fuse_patterns([
+        r'\b(?:chronic|long-term|persistent|ongoing)\b',
+        r'\b(?:lifelong|permanent|established)\b'
+    ])
+}
+
+# Modifier classes in reporting order, and one alternation of all of them so
+# a text is scanned once; each hit is then classified against every class,
+# since some words ("ongoing", "rule out") belong to more than one
+MODIFIER_CLASSES = (
+    (ContextModifier.NEGATION, NEGATION_PATTERNS),
+    (ContextModifier.UNCERTAINTY, UNCERTAINTY_PATTERNS),
+    *TEMPORAL_PATTERNS.items()
+)
+MODIFIER_PATTERN = _fuse_patterns([pattern.pattern for _, pattern in MODIFIER_CLASSES])
+
+# Each domain's keyword groups are fused into one alternation so scoring a
+# domain is a single findall pass over the text
+DOMAIN_PATTERNS = {
+    ClinicalDomain.CARDIOLOGY: _fuse_patterns([
+        r'\b(?:heart|cardiac|cardio|coronary|myocardial|pericardial)\b',
+        r'\b(?:arrhythmia|tachycardia|bradycardia|fibrillation)\b',
+        r'\b(?:ecg|ekg|echo|catheterization|angiogram)\b'
+    ]),
+    ClinicalDomain.PULMONOLOGY: _fuse_patterns([
+        r'\b(?:lung|pulmonary|respiratory|bronchial|alveolar)\b',
+        r'\b(?:asthma|copd|pneumonia|bronchitis|emphysema)\b',
+        r'\b(?:chest\s+x-ray|ct\s+chest|spirometry)\b'
+    ]),
+    ClinicalDomain.LABORATORY: _fuse_patterns([
+        r'\b(?:lab|laboratory|blood|serum|plasma|urine)\b',
+        r'\b(?:glucose|cholesterol|hemoglobin|creatinine)\b',
+        r'\b(?:test|level|result|value|measurement)\b'
+    ]),
+    ClinicalDomain.ENDOCRINOLOGY: _fuse_patterns([
+        r'\b(?:diabetes|diabetic|insulin|glucose|thyroid)\b',
+        r'\b(?:hormone|endocrine|metabolic|adrenal)\b',
+        r'\b(?:hba1c|tsh|t3|t4|cortisol)\b'
+    ])
+}
+
+# Semantic context feature patterns
+_MEDICAL_SUFFIX_RE = re.compile(r'\b\w+(?:ology|itis|osis|pathy|graphy|scopy)\b')
+_NUMERIC_VALUE_RE = re.compile(r'\b\d+(?:\.\d+)?\s*(?:mg|ml|cm|mm|%|units?)\b')
+_DOSAGE_RE = re.compile(r'\b\d+\s*(?:mg|ml|units?)\b')
+_MEASUREMENT_RE = re.compile(r'\b\d+(?:\.\d+)?\s*(?:cm|mm|inches?|feet)\b')
+
+# System URLs mapped to the short names the fuzzy matcher expects
+SYSTEM_NAMES = {
+    'http://snomed.info/sct': 'snomed',
+    'http://loinc.org': 'loinc',
+    'http://www.nlm.nih.gov/research/umls/rxnorm': 'rxnorm'
+}
+
+# Domains where a SNOMED mapping is considered domain-relevant
+SNOMED_RELEVANT_DOMAINS = frozenset({ClinicalDomain.CARDIOLOGY, ClinicalDomain.ENDOCRINOLOGY})
+
+
+@dataclass(slots=True, frozen=True)
 class ClinicalContext:
     """Clinical context for term mapping."""
     domain: ClinicalDomain
@@ -58,7 +153,7 @@ class ClinicalContext:
             raise ValueError("Confidence must be between 0.0 and 1.0")
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ContextAwareMapping:
     """Mapping result with context."""
     original_text: str
@@ -98,64 +193,20 @@ class ContextAwareTerminologyMapper:
         # Initialize semantic scoring
         self._initialize_semantic_scoring()
         
+        # Per-instance LRU caches for the text-only detectors; templated
+        # phrases recur across notes and skip the regex passes on a hit
+        cache_size = self.config.get("context_cache_size", 8192)
+        self._detect_modifiers_cached = lru_cache(maxsize=cache_size)(self._detect_modifiers)
+        self._detect_domain_cached = lru_cache(maxsize=cache_size)(self._detect_clinical_domain)
+        
         logger.info("Context-aware terminology mapper initialized")
     
     def _initialize_context_patterns(self):
         """Initialize patterns for context detection."""
-        # Negation patterns
-        self.negation_patterns = [
-            r'\b(?:no|not|without|absent|negative|denies?|rules?\s+out)\b',
-            r'\b(?:never|none|nowhere|nothing|nobody)\b',
-            r'\b(?:cannot|can\'t|won\'t|wouldn\'t|shouldn\'t)\b'
-        ]
-        
-        # Uncertainty patterns
-        self.uncertainty_patterns = [
-            r'\b(?:possible|possibly|probable|probably|likely|unlikely)\b',
-            r'\b(?:suspect|suspected|consider|considering|rule\s+out)\b',
-            r'\b(?:may|might|could|would|should)\b',
-            r'\b(?:appears?|seems?|suggests?|consistent\s+with)\b'
-        ]
-        
-        # Temporal patterns
-        self.temporal_patterns = {
-            ContextModifier.PAST_HISTORY: [
-                r'\b(?:history\s+of|h/o|hx\s+of|previous|prior|past)\b',
-                r'\b(?:formerly|previously|once|used\s+to)\b'
-            ],
-            ContextModifier.CURRENT: [
-                r'\b(?:current|currently|present|active|ongoing)\b',
-                r'\b(?:now|today|recently|acute)\b'
-            ],
-            ContextModifier.CHRONIC: [
-                r'\b(?:chronic|long-term|persistent|ongoing)\b',
-                r'\b(?:lifelong|permanent|established)\b'
-            ]
-        }
-        
-        # Domain patterns
-        self.domain_patterns = {
-            ClinicalDomain.CARDIOLOGY: [
-                r'\b(?:heart|cardiac|cardio|coronary|myocardial|pericardial)\b',
-                r'\b(?:arrhythmia|tachycardia|bradycardia|fibrillation)\b',
-                r'\b(?:ecg|ekg|echo|catheterization|angiogram)\b'
-            ],
-            ClinicalDomain.PULMONOLOGY: [
-                r'\b(?:lung|pulmonary|respiratory|bronchial|alveolar)\b',
-                r'\b(?:asthma|copd|pneumonia|bronchitis|emphysema)\b',
-                r'\b(?:chest\s+x-ray|ct\s+chest|spirometry)\b'
-            ],
-            ClinicalDomain.LABORATORY: [
-                r'\b(?:lab|laboratory|blood|serum|plasma|urine)\b',
-                r'\b(?:glucose|cholesterol|hemoglobin|creatinine)\b',
-                r'\b(?:test|level|result|value|measurement)\b'
-            ],
-            ClinicalDomain.ENDOCRINOLOGY: [
-                r'\b(?:diabetes|diabetic|insulin|glucose|thyroid)\b',
-                r'\b(?:hormone|endocrine|metabolic|adrenal)\b',
-                r'\b(?:hba1c|tsh|t3|t4|cortisol)\b'
-            ]
-        }
+        self.negation_patterns = NEGATION_PATTERNS
+        self.uncertainty_patterns = UNCERTAINTY_PATTERNS
+        self.temporal_patterns = TEMPORAL_PATTERNS
+        self.domain_patterns = DOMAIN_PATTERNS
     
     def _initialize_domain_mappings(self):
         """Initialize domain-specific mapping preferences."""
@@ -327,29 +378,10 @@ class ContextAwareTerminologyMapper:
         full_text = f"{context_text} {term}".lower()
         
         # Detect modifiers
-        modifiers = []
-        
-        # Check for negation
-        for pattern in self.negation_patterns:
-            if re.search(pattern, full_text, re.IGNORECASE):
-                modifiers.append(ContextModifier.NEGATION)
-                break
-        
-        # Check for uncertainty
-        for pattern in self.uncertainty_patterns:
-            if re.search(pattern, full_text, re.IGNORECASE):
-                modifiers.append(ContextModifier.UNCERTAINTY)
-                break
-        
-        # Check for temporal modifiers
-        for modifier, patterns in self.temporal_patterns.items():
-            for pattern in patterns:
-                if re.search(pattern, full_text, re.IGNORECASE):
-                    modifiers.append(modifier)
-                    break
+        modifiers = list(self._detect_modifiers_cached(full_text))
         
         # Detect clinical domain
-        detected_domain = domain_hint or self._detect_clinical_domain(full_text)
+        detected_domain = domain_hint or self._detect_domain_cached(full_text)
         
         # Calculate context confidence
         confidence = self._calculate_context_confidence(full_text, detected_domain, modifiers)
@@ -365,6 +397,28 @@ class ContextAwareTerminologyMapper:
             semantic_context=semantic_context
         )
     
+    def _detect_modifiers(self, text: str) -> Tuple[ContextModifier, ...]:
+        """
+        Detect negation, uncertainty and temporal modifiers in text.
+        
+        Args:
+            text: Lowercased text to analyze
+            
+        Returns:
+            Tuple of detected ContextModifiers
+        """
+        found = set()
+        
+        for match in MODIFIER_PATTERN.finditer(text):
+            hit = match.group()
+            for modifier, pattern in MODIFIER_CLASSES:
+                if modifier not in found and pattern.fullmatch(hit):
+                    found.add(modifier)
+            if len(found) == len(MODIFIER_CLASSES):
+                break
+        
+        return tuple(modifier for modifier, _ in MODIFIER_CLASSES if modifier in found)
+    
     def _detect_clinical_domain(self, text: str) -> ClinicalDomain:
         """
         Detect the most likely clinical domain from text.
@@ -377,12 +431,8 @@ class ContextAwareTerminologyMapper:
         """
         domain_scores = {}
         
-        for domain, patterns in self.domain_patterns.items():
-            score = 0
-            for pattern in patterns:
-                matches = len(re.findall(pattern, text, re.IGNORECASE))
-                score += matches
-            
+        for domain, pattern in self.domain_patterns.items():
+            score = len(pattern.findall(text))
             if score > 0:
                 domain_scores[domain] = score
         
@@ -434,10 +484,10 @@ class ContextAwareTerminologyMapper:
         return {
             'word_count': len(text.split()),
             'term_position': text.lower().find(term.lower()),
-            'medical_terms_count': len(re.findall(r'\b\w+(?:ology|itis|osis|pathy|graphy|scopy)\b', text)),
-            'numeric_values': len(re.findall(r'\b\d+(?:\.\d+)?\s*(?:mg|ml|cm|mm|%|units?)\b', text)),
-            'has_dosage': bool(re.search(r'\b\d+\s*(?:mg|ml|units?)\b', text)),
-            'has_measurement': bool(re.search(r'\b\d+(?:\.\d+)?\s*(?:cm|mm|inches?|feet)\b', text))
+            'medical_terms_count': len(_MEDICAL_SUFFIX_RE.findall(text)),
+            'numeric_values': len(_NUMERIC_VALUE_RE.findall(text)),
+            'has_dosage': bool(_DOSAGE_RE.search(text)),
+            'has_measurement': bool(_MEASUREMENT_RE.search(text))
         }
     
     def _enhance_mapping_with_context(self, base_mapping: Dict[str, Any], 
@@ -496,17 +546,10 @@ class ContextAwareTerminologyMapper:
             
             # Use fuzzy matcher with domain preference
             if hasattr(self.base_mapper, 'fuzzy_matcher') and self.base_mapper.fuzzy_matcher:
-                # Map URLs to simple names
-                system_mapping = {
-                    'http://snomed.info/sct': 'snomed',
-                    'http://loinc.org': 'loinc', 
-                    'http://www.nlm.nih.gov/research/umls/rxnorm': 'rxnorm'
-                }
-                
                 # Try each preferred system
                 preferred_urls = prefs.get('preferred_systems', ['http://snomed.info/sct', 'http://loinc.org'])
                 for preferred_url in preferred_urls:
-                    preferred_system = system_mapping.get(preferred_url, preferred_url)
+                    preferred_system = SYSTEM_NAMES.get(preferred_url, preferred_url)
                     fuzzy_result = self.base_mapper.fuzzy_matcher.find_fuzzy_match(
                         term, system=preferred_system, context=context_text
                     )
@@ -592,7 +635,7 @@ class ContextAwareTerminologyMapper:
         # Default relevance based on system
         if 'loinc.org' in system and domain == ClinicalDomain.LABORATORY:
             return 0.95
-        elif 'snomed.info' in system and domain in [ClinicalDomain.CARDIOLOGY, ClinicalDomain.ENDOCRINOLOGY]:
+        elif 'snomed.info' in system and domain in SNOMED_RELEVANT_DOMAINS:
             return 0.85
         elif 'rxnorm' in system and domain == ClinicalDomain.GENERAL:
             return 0.8
@@ -649,6 +692,11 @@ class ContextAwareTerminologyMapper:
         """
         Map multiple terms with their contexts in batch.
         
+        Terms are mapped one after another unless config 'batch_threads' is
+        greater than 1, in which case they are spread over a thread pool of
+        that size; TerminologyMapper's embedded database connections can be
+        shared across threads. Results keep the input order either way.
+        
         Args:
             terms_with_context: List of (term, context) tuples
             domain_hint: Optional domain hint for all terms
@@ -658,38 +706,48 @@ class ContextAwareTerminologyMapper:
         """
         logger.info(f"Batch context-aware mapping for {len(terms_with_context)} terms")
         
-        results = []
-        for term, context in terms_with_context:
-            try:
-                result = self.map_with_context(term, context, domain_hint)
-                results.append(result)
-            except Exception as e:
-                logger.error(f"Error mapping term '{term}': {e}")
-                # Add error result
-                results.append(ContextAwareMapping(
-                    original_text=term,
-                    found=False,
-                    system=None,
-                    code=None,
-                    display=None,
-                    confidence=0.0,
-                    match_type='error',
-                    clinical_context=ClinicalContext(
-                        domain=ClinicalDomain.GENERAL,
-                        modifiers=[],
-                        surrounding_text=context,
-                        confidence=0.0,
-                        semantic_context={}
-                    ),
-                    context_score=0.0,
-                    semantic_score=0.0,
-                    domain_relevance=0.0,
-                    alternative_mappings=[]
-                ))
+        def map_item(term_with_context):
+            term, context = term_with_context
+            return self._map_batch_item(term, context, domain_hint)
+        
+        batch_threads = self.config.get('batch_threads', 1)
+        if batch_threads > 1 and len(terms_with_context) > 1:
+            with ThreadPoolExecutor(max_workers=batch_threads) as executor:
+                results = list(executor.map(map_item, terms_with_context))
+        else:
+            results = [map_item(item) for item in terms_with_context]
         
         logger.info(f"Completed batch context-aware mapping: {sum(1 for r in results if r.found)}/{len(results)} successful")
         return results
     
+    def _map_batch_item(self, term: str, context: str,
+                        domain_hint: ClinicalDomain = None) -> ContextAwareMapping:
+        """Map one batch entry, turning an unexpected failure into an error result."""
+        try:
+            return self.map_with_context(term, context, domain_hint)
+        except Exception as e:
+            logger.error(f"Error mapping term '{term}': {e}")
+            return ContextAwareMapping(
+                original_text=term,
+                found=False,
+                system=None,
+                code=None,
+                display=None,
+                confidence=0.0,
+                match_type='error',
+                clinical_context=ClinicalContext(
+                    domain=ClinicalDomain.GENERAL,
+                    modifiers=[],
+                    surrounding_text=context,
+                    confidence=0.0,
+                    semantic_context={}
+                ),
+                context_score=0.0,
+                semantic_score=0.0,
+                domain_relevance=0.0,
+                alternative_mappings=[]
+            )
+    
     def get_context_statistics(self, mappings: List[ContextAwareMapping]) -> Dict[str, Any]:
         """
         Get statistics about context-aware mappings.
@@ -703,34 +761,33 @@ class ContextAwareTerminologyMapper:
         if not mappings:
             return {}
         
-        successful_mappings = [m for m in mappings if m.found]
+        domain_counts = Counter()
+        modifier_counts = Counter()
+        successful = 0
+        with_alternatives = 0
+        # Score sums cover successful mappings only
+        context_total = semantic_total = domain_relevance_total = 0
         
-        # Domain distribution
-        domain_counts = {}
+        # Gather every statistic in one pass over the mappings
         for mapping in mappings:
-            domain = mapping.clinical_context.domain.value
-            domain_counts[domain] = domain_counts.get(domain, 0) + 1
-        
-        # Modifier distribution
-        modifier_counts = {}
-        for mapping in mappings:
-            for modifier in mapping.clinical_context.modifiers:
-                mod_name = modifier.value
-                modifier_counts[mod_name] = modifier_counts.get(mod_name, 0) + 1
-        
-        # Score statistics
-        context_scores = [m.context_score for m in successful_mappings]
-        semantic_scores = [m.semantic_score for m in successful_mappings]
-        domain_relevance_scores = [m.domain_relevance for m in successful_mappings]
+            domain_counts[mapping.clinical_context.domain.value] += 1
+            modifier_counts.update(modifier.value for modifier in mapping.clinical_context.modifiers)
+            if mapping.alternative_mappings:
+                with_alternatives += 1
+            if mapping.found:
+                successful += 1
+                context_total += mapping.context_score
+                semantic_total += mapping.semantic_score
+                domain_relevance_total += mapping.domain_relevance
         
         return {
             'total_mappings': len(mappings),
-            'successful_mappings': len(successful_mappings),
-            'success_rate': len(successful_mappings) / len(mappings) if mappings else 0,
-            'domain_distribution': domain_counts,
-            'modifier_distribution': modifier_counts,
-            'average_context_score': sum(context_scores) / len(context_scores) if context_scores else 0,
-            'average_semantic_score': sum(semantic_scores) / len(semantic_scores) if semantic_scores else 0,
-            'average_domain_relevance': sum(domain_relevance_scores) / len(domain_relevance_scores) if domain_relevance_scores else 0,
-            'has_alternatives': sum(1 for m in mappings if m.alternative_mappings),
+            'successful_mappings': successful,
+            'success_rate': successful / len(mappings),
+            'domain_distribution': dict(domain_counts),
+            'modifier_distribution': dict(modifier_counts),
+            'average_context_score': context_total / successful if successful else 0,
+            'average_semantic_score': semantic_total / successful if successful else 0,
+            'average_domain_relevance': domain_relevance_total / successful if successful else 0,
+            'has_alternatives': with_alternatives,
         }
\ No newline at end of file
@@ -1,13 +1,32 @@
 """Embedded database manager for terminology mapping."""
 
 import os
+import csv
 import sqlite3
 import json
 import logging
+from pathlib import Path
 from typing import Dict, List, Optional, Any, Tuple, Union
 
 logger = logging.getLogger(__name__)
 
+# Columns matched with LOWER(column) = ?; an index on the plain column cannot
+# serve those lookups, so each gets an expression index on LOWER(column)
+LOWERCASE_LOOKUP_COLUMNS = {
+    "snomed": [("snomed_concepts", "term")],
+    "loinc": [("loinc_concepts", "term"), ("loinc_concepts", "component")],
+    "rxnorm": [("rxnorm_concepts", "term"), ("rxnorm_concepts", "ingredient"),
+               ("rxnorm_concepts", "brand_name")]
+}
+
+# Read-side tuning applied to every terminology connection: memory-map up to
+# 256 MB of the file and give each connection an 8 MB page cache. Journal mode
+# is left alone so no -wal/-shm files appear next to the shipped databases.
+READ_PRAGMAS = (
+    "PRAGMA mmap_size = 268435456",
+    "PRAGMA cache_size = -8000",
+)
+
 class EmbeddedDatabaseManager:
     """Manages embedded terminology databases."""
     
@@ -19,6 +38,12 @@ class EmbeddedDatabaseManager:
             'data', 'terminology'
         )
         
+        # Database file for each supported terminology system
+        self.db_files = {
+            "snomed": os.path.join(self.data_dir, "snomed_core.sqlite"),
+            "loinc": os.path.join(self.data_dir, "loinc_core.sqlite"),
+            "rxnorm": os.path.join(self.data_dir, "rxnorm_core.sqlite")
+        }
         self.connections = {}
         self.custom_mappings = {}
         
@@ -27,17 +52,16 @@ class EmbeddedDatabaseManager:
     def connect(self) -> bool:
         """Connect to embedded databases."""
         try:
-            databases = {
-                "snomed": os.path.join(self.data_dir, "snomed_core.sqlite"),
-                "loinc": os.path.join(self.data_dir, "loinc_core.sqlite"),
-                "rxnorm": os.path.join(self.data_dir, "rxnorm_core.sqlite")
-            }
-            
-            for db_name, db_path in databases.items():
+            for db_name, db_path in self.db_files.items():
                 if os.path.exists(db_path):
                     logger.info(f"Connecting to {db_name} database at {db_path}")
-                    self.connections[db_name] = sqlite3.connect(db_path)
+                    # Lookups only read, so the connection is shared across
+                    # threads (e.g. context-aware batch_threads); data loading
+                    # must not run while other threads are looking terms up
+                    self.connections[db_name] = sqlite3.connect(db_path, check_same_thread=False)
                     self.connections[db_name].execute("PRAGMA foreign_keys = ON")
+                    for pragma in READ_PRAGMAS:
+                        self.connections[db_name].execute(pragma)
                 else:
                     logger.warning(f"{db_name} database not found at {db_path}, creating empty database")
                     self._create_empty_database(db_name, db_path)
@@ -71,7 +95,7 @@ class EmbeddedDatabaseManager:
             os.makedirs(os.path.dirname(db_path), exist_ok=True)
             
             # Connect to the database
-            conn = sqlite3.connect(db_path)
+            conn = sqlite3.connect(db_path, check_same_thread=False)
             cursor = conn.cursor()
             
             # Create tables based on database type
@@ -242,11 +266,97 @@ class EmbeddedDatabaseManager:
             
             # Commit changes and add to connections
             conn.commit()
+            self._ensure_lookup_indexes(db_name, conn)
+            for pragma in READ_PRAGMAS:
+                conn.execute(pragma)
             self.connections[db_name] = conn
             logger.info(f"Created empty {db_name} database at {db_path}")
         except Exception as e:
             logger.error(f"Error creating {db_name} database: {e}")
     
+    def _ensure_lookup_indexes(self, db_name: str, conn: sqlite3.Connection) -> None:
+        """
+        Create the LOWER(column) expression indexes used by exact lookups.
+        
+        Without them every exact-match query is a full table scan. New
+        databases get them when they are created and imported data when it
+        is loaded; existing files get them through build_lookup_indexes,
+        never on connect.
+        
+        Args:
+            db_name: Name of the database (snomed, loinc, rxnorm)
+            conn: Open connection to that database
+        """
+        for table, column in LOWERCASE_LOOKUP_COLUMNS.get(db_name, []):
+            try:
+                conn.execute(
+                    f"CREATE INDEX IF NOT EXISTS idx_{table}_{column}_lower "
+                    f"ON {table}(LOWER({column}))"
+                )
+            except sqlite3.Error as e:
+                # Read-only or older-schema databases still work, just unindexed
+                logger.debug(f"Could not index LOWER({column}) on {table}: {e}")
+        try:
+            conn.commit()
+        except sqlite3.Error as e:
+            logger.debug(f"Could not commit lookup indexes for {db_name}: {e}")
+    
+    def build_lookup_indexes(self) -> None:
+        """
+        Add the LOWER(column) lookup indexes to every connected database.
+        
+        import_concepts does this itself; run it once after loading or
+        replacing terminology data any other way (e.g. direct SQL import).
+        Connecting only reads the database files, so databases built before
+        these indexes existed stay unindexed until this is called.
+        """
+        for db_name, conn in self.connections.items():
+            self._ensure_lookup_indexes(db_name, conn)
+    
+    def import_concepts(self, system: str, csv_path: str) -> int:
+        """
+        Load concepts from a CSV file into a system's concepts table.
+        
+        The CSV header names the columns to fill (see sample_data for the
+        layout); columns the table doesn't have are ignored. The lookup
+        indexes are built once the rows are in.
+        
+        Args:
+            system: The terminology system (snomed, loinc, rxnorm)
+            csv_path: Path to the CSV file
+            
+        Returns:
+            Number of concepts imported
+        """
+        if system not in self.connections:
+            logger.error(f"No database connection for {system}")
+            return 0
+        
+        conn = self.connections[system]
+        table = f"{system}_concepts"
+        try:
+            with open(csv_path, newline='') as f:
+                rows = list(csv.DictReader(f))
+            if not rows:
+                return 0
+            
+            table_columns = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+            columns = [column for column in rows[0] if column in table_columns]
+            conn.executemany(
+                f"INSERT INTO {table} ({', '.join(columns)}) "
+                f"VALUES ({', '.join('?' for _ in columns)})",
+                ([row[column] or None for column in columns] for row in rows)
+            )
+            conn.commit()
+            self._ensure_lookup_indexes(system, conn)
+            
+            logger.info(f"Imported {len(rows)} {system} concepts from {csv_path}")
+            return len(rows)
+        except Exception as e:
+            conn.rollback()
+            logger.error(f"Error importing {system} concepts from {csv_path}: {e}")
+            return 0
+    
     def lookup_snomed(self, term: str, include_hierarchy: bool = False) -> Optional[Dict[str, Any]]:
         """
         Look up a term in the SNOMED CT database.
@@ -1668,6 +1778,54 @@ class EmbeddedDatabaseManager:
             logger.error(f"Error adding custom mapping for '{term}': {e}")
             return False
     
+    def probe_all(self, systems: Optional[List[str]] = None) -> Dict[str, int]:
+        """
+        Check that the terminology database files can be opened and read.
+
+        All databases are attached read-only to a single connection and probed
+        with one UNION ALL query, rather than opening and querying each file
+        in turn.
+
+        Args:
+            systems: Systems to probe (defaults to all of db_files)
+
+        Returns:
+            Dictionary mapping each readable system to its schema object count;
+            systems whose database file is missing are left out
+
+        Raises:
+            ValueError: If a system isn't one of db_files
+        """
+        systems = systems or list(self.db_files)
+        # System names become schema names in the SQL, so only known ones pass
+        unknown = [system for system in systems if system not in self.db_files]
+        if unknown:
+            raise ValueError(f"Unknown terminology systems: {', '.join(map(str, unknown))}")
+        attached = [
+            (system, self.db_files[system])
+            for system in systems
+            if os.path.exists(self.db_files[system])
+        ]
+        if not attached:
+            return {}
+
+        conn = sqlite3.connect(":memory:", uri=True)
+        try:
+            for system, path in attached:
+                uri = Path(path).resolve().as_uri() + "?mode=ro"
+                conn.execute(f"ATTACH DATABASE ? AS {system}", (uri,))
+
+            query = " UNION ALL ".join(
+                f"SELECT '{system}', COUNT(*) FROM {system}.sqlite_master"
+                for system, _ in attached
+            )
+            return dict(conn.execute(query).fetchall())
+        except Exception as e:
+            logger.error(f"Error probing databases: {e}")
+            return {}
+        finally:
+            conn.close()
+
     def get_statistics(self) -> Dict[str, Any]:
         """
         Get statistics about the databases.
@@ -1699,7 +1857,7 @@ class EmbeddedDatabaseManager:
                     stats[system]["count"] = cursor.fetchone()[0]
                     
                     # Get database file size
-                    db_path = os.path.join(self.data_dir, f"{system}_core.sqlite")
+                    db_path = self.db_files[system]
                     if os.path.exists(db_path):
                         stats[system]["database_size"] = os.path.getsize(db_path)
                 except Exception as e:
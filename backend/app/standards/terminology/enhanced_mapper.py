@@ -2,7 +2,7 @@
 
 import logging
 from typing import Dict, List, Optional, Any, Tuple
-from dataclasses import dataclass
+from dataclasses import dataclass, asdict
 from datetime import datetime
 
 from .context_aware_mapper import ContextAwareTerminologyMapper, ClinicalDomain, ContextAwareMapping
@@ -429,7 +429,7 @@ class EnhancedTerminologyMapper:
                 term=term,
                 mappings=final_mappings,
                 context_info={
-                    'clinical_context': context_mapping.clinical_context.__dict__ if context_mapping.clinical_context else None,
+                    'clinical_context': asdict(context_mapping.clinical_context) if context_mapping.clinical_context else None,
                     'context_text': context_text,
                     'domain_hint': domain_hint.value if domain_hint else None
                 },
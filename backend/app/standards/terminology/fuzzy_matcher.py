@@ -3,12 +3,16 @@
 import os
 import re
 import json
+import math
 import logging
 import sqlite3
+from functools import lru_cache
 from typing import Dict, List, Optional, Any, Tuple, Union
 from collections import defaultdict
 from difflib import SequenceMatcher
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
 try:
@@ -21,14 +25,19 @@ except ImportError:
 
 try:
     from sklearn.feature_extraction.text import TfidfVectorizer
-    from sklearn.metrics.pairwise import cosine_similarity
-    import numpy as np
+    from sklearn.metrics.pairwise import linear_kernel
     HAS_SKLEARN = True
     logger.info("scikit-learn available for TF-IDF vectorization")
 except ImportError:
     logger.warning("scikit-learn not available, TF-IDF vectorization will be disabled")
     HAS_SKLEARN = False
 
+# Upper bound on query x candidate cells scored per process.cdist call
+CDIST_MAX_CELLS = 5_000_000
+
+_NON_WORD_RE = re.compile(r'[^\w\s]')
+_WHITESPACE_RE = re.compile(r'\s+')
+
 class FuzzyMatcher:
     """Fuzzy matcher for medical terminology."""
     
@@ -37,6 +46,7 @@ class FuzzyMatcher:
         self.config = config or {}
         self.db_manager = db_manager
         self.stopwords = self._load_stopwords()
+        self._stopword_set = frozenset(self.stopwords)
         self.synonym_expander = None
         
         self.term_index = {
@@ -54,6 +64,10 @@ class FuzzyMatcher:
         self.vectorizers = {}
         self.vector_matrices = {}
         
+        # Derived candidate structures per system, see _get_candidates;
+        # dropped whenever term_index is rebuilt or changed
+        self._candidate_cache = {}
+        
         self.synonyms = {}
         
         self.thresholds = {
@@ -136,6 +150,12 @@ class FuzzyMatcher:
             'trophy': 'growth'
         }
         
+        # Per-instance LRU cache for _generate_term_variations; call
+        # clear_cache() after changing synonyms or abbreviations
+        self._variations_cached = lru_cache(
+            maxsize=self.config.get("variation_cache_size", 16384)
+        )(self._build_term_variations)
+        
         self._load_synonyms()
     
     def _load_stopwords(self) -> List[str]:
@@ -226,6 +246,8 @@ class FuzzyMatcher:
         except Exception as e:
             logger.error(f"Error building index for {system}: {e}")
             return False
+        finally:
+            self._candidate_cache.pop(system, None)
     
     def _initialize_vectorizer(self):
         """Initialize the TF-IDF vectorizer for cosine similarity matching."""
@@ -247,7 +269,8 @@ class FuzzyMatcher:
                     tokenizer=self._tokenize,
                     lowercase=True,
                     stop_words=self.stopwords,
-                    ngram_range=(1, 2)  # Use unigrams and bigrams
+                    ngram_range=(1, 2),  # Use unigrams and bigrams
+                    dtype=np.float32  # Halves matrix memory; scores only need ~4 digits
                 )
                 
                 # Build the document-term matrix
@@ -260,6 +283,11 @@ class FuzzyMatcher:
         except Exception as e:
             logger.error(f"Error initializing vectorizer: {e}")
     
+    def clear_cache(self):
+        """Drop all cached term variations and candidate structures."""
+        self._variations_cached.cache_clear()
+        self._candidate_cache.clear()
+    
     def _generate_term_variations(self, term: str) -> List[str]:
         """
         Generate variations of a term for fuzzy matching.
@@ -270,6 +298,10 @@ class FuzzyMatcher:
         Returns:
             List of term variations
         """
+        return list(self._variations_cached(term))
+    
+    def _build_term_variations(self, term: str) -> Tuple[str, ...]:
+        """Build the variations of a term; cached by _generate_term_variations."""
         variations = set([term])
         
         # Remove common prefixes
@@ -279,11 +311,11 @@ class FuzzyMatcher:
                 variations.add(term[len(prefix):])
         
         # Remove punctuation
-        term_no_punct = re.sub(r'[^\w\s]', ' ', term)
+        term_no_punct = _NON_WORD_RE.sub(' ', term)
         variations.add(term_no_punct)
         
         # Normalize whitespace
-        term_norm = re.sub(r'\s+', ' ', term_no_punct).strip()
+        term_norm = _WHITESPACE_RE.sub(' ', term_no_punct).strip()
         variations.add(term_norm)
         
         # Check for abbreviation expansions
@@ -317,7 +349,7 @@ class FuzzyMatcher:
                 variations.update([s.lower() for s in syn_set])
         
         # Remove duplicates and empty strings
-        return [v for v in list(variations) if v]
+        return tuple(v for v in variations if v)
     
     def find_fuzzy_match(self, term: str, system: str, context: Optional[str] = None) -> Optional[Dict[str, Any]]:
         """
@@ -336,23 +368,12 @@ class FuzzyMatcher:
             
         # Normalize the term
         clean_term = term.lower()
-        clean_term = re.sub(r'\s+', ' ', clean_term).strip()
-        
-        # Generate variations of the term
-        variations = self._generate_term_variations(clean_term)
+        clean_term = _WHITESPACE_RE.sub(' ', clean_term).strip()
         
         # Try direct match with variations first
-        for var in variations:
-            if var in self.term_index[system]:
-                match_info = self.term_index[system][var]
-                return {
-                    "code": match_info["code"],
-                    "display": match_info["display"],
-                    "system": self._get_system_uri(system),
-                    "found": True,
-                    "match_type": "variation",
-                    "score": 100
-                }
+        variation_match = self._find_variation_match(clean_term, system)
+        if variation_match:
+            return variation_match
         
         # Determine which matching approach to use
         results = []
@@ -374,7 +395,86 @@ class FuzzyMatcher:
             if cosine_match:
                 results.append(cosine_match)
         
-        # Find the best match from all results
+        return self._select_best_match(results, term, context, system)
+    
+    def find_fuzzy_matches(self, terms: List[str], system: str, context: Optional[str] = None) -> List[Optional[Dict[str, Any]]]:
+        """
+        Find the best fuzzy match for each of several terms.
+        
+        Gives the same results as calling find_fuzzy_match per term, but when
+        RapidFuzz is available the string scorers run once over the whole
+        batch with process.cdist instead of once per term.
+        
+        Args:
+            terms: The terms to find matches for
+            system: The terminology system to search (snomed, loinc, rxnorm)
+            context: Optional context shared by all terms
+            
+        Returns:
+            List with a mapping dictionary or None for each input term
+        """
+        matches: List[Optional[Dict[str, Any]]] = [None] * len(terms)
+        pending = []
+        
+        for i, term in enumerate(terms):
+            if not term:
+                continue
+            clean_term = term.lower()
+            clean_term = _WHITESPACE_RE.sub(' ', clean_term).strip()
+            
+            variation_match = self._find_variation_match(clean_term, system)
+            if variation_match:
+                matches[i] = variation_match
+            else:
+                pending.append((i, clean_term))
+        
+        if not pending:
+            return matches
+        
+        clean_terms = [clean_term for _, clean_term in pending]
+        if HAS_RAPIDFUZZ:
+            string_matches = self._find_rapidfuzz_matches(clean_terms, system)
+        else:
+            string_matches = [self._find_basic_fuzzy_match(t, system, context) for t in clean_terms]
+        
+        use_cosine = HAS_SKLEARN and hasattr(self, 'vectorizers') and self.vectorizers.get(system)
+        for (i, clean_term), string_match in zip(pending, string_matches):
+            results = [string_match] if string_match else []
+            if use_cosine:
+                cosine_match = self._find_cosine_match(clean_term, system)
+                if cosine_match:
+                    results.append(cosine_match)
+            matches[i] = self._select_best_match(results, terms[i], context, system)
+        
+        return matches
+    
+    def _find_variation_match(self, clean_term: str, system: str) -> Optional[Dict[str, Any]]:
+        """Look up the term, then its generated variations, directly in the index."""
+        index = self.term_index[system]
+        
+        # An exact hit needs no variations; it is also the one a caller expects
+        # when several variations are indexed
+        match_info = index.get(clean_term)
+        if match_info is None:
+            for var in self._generate_term_variations(clean_term):
+                if var in index:
+                    match_info = index[var]
+                    break
+        if match_info is None:
+            return None
+        
+        return {
+            "code": match_info["code"],
+            "display": match_info["display"],
+            "system": self._get_system_uri(system),
+            "found": True,
+            "match_type": "variation",
+            "score": 100
+        }
+    
+    def _select_best_match(self, results: List[Dict[str, Any]], term: str,
+                           context: Optional[str], system: str) -> Optional[Dict[str, Any]]:
+        """Pick the highest scoring candidate and apply context adjustments."""
         best_match = None
         best_score = 0
         
@@ -405,14 +505,19 @@ class FuzzyMatcher:
         if not self.term_index[system]:
             return None
             
-        terms = list(self.term_index[system].keys())
+        terms = self._get_candidates(system)["terms"]
+        
+        # The query and the indexed terms are already lowercased and
+        # whitespace-normalized, so no scorer runs a processor over them
         
-        # 1. Simple ratio (overall similarity)
+        # 1. Simple ratio (overall similarity), only over candidates whose
+        # length leaves the cutoff reachable
         ratio_matches = process.extractOne(
             term,
-            terms,
+            self._ratio_candidates(term, system),
             scorer=fuzz.ratio,
-            score_cutoff=self.thresholds["ratio"]
+            score_cutoff=self.thresholds["ratio"],
+            processor=None
         )
         
         # 2. Partial ratio (best partial string alignment)
@@ -420,7 +525,8 @@ class FuzzyMatcher:
             term,
             terms,
             scorer=fuzz.partial_ratio,
-            score_cutoff=self.thresholds["partial_ratio"]
+            score_cutoff=self.thresholds["partial_ratio"],
+            processor=None
         )
         
         # 3. Token sort ratio (order-independent similarity)
@@ -428,7 +534,8 @@ class FuzzyMatcher:
             term,
             terms,
             scorer=fuzz.token_sort_ratio,
-            score_cutoff=self.thresholds["token_sort_ratio"]
+            score_cutoff=self.thresholds["token_sort_ratio"],
+            processor=None
         )
         
         # 4. Token set ratio (considers only unique words)
@@ -436,7 +543,8 @@ class FuzzyMatcher:
             term,
             terms,
             scorer=fuzz.token_set_ratio,
-            score_cutoff=self.thresholds["token_sort_ratio"]
+            score_cutoff=self.thresholds["token_sort_ratio"],
+            processor=None
         )
         
         # 5. Determine the best match
@@ -479,6 +587,133 @@ class FuzzyMatcher:
             
         return None
     
+    def _get_candidates(self, system: str) -> Dict[str, Any]:
+        """
+        Get the candidate terms for a system along with derived structures.
+        
+        The structures are computed once per index rather than once per
+        query; anything that rebuilds or changes term_index must drop them,
+        as _build_index and clear_cache do.
+        
+        Args:
+            system: The terminology system
+            
+        Returns:
+            Dictionary with the candidate "terms" in index order, their
+            positions grouped by term length ("length_buckets") and, once
+            requested through _get_candidate_tokens, their token sets
+        """
+        cached = self._candidate_cache.get(system)
+        if cached is None:
+            terms = list(self.term_index[system].keys())
+            length_buckets = defaultdict(list)
+            for position, candidate in enumerate(terms):
+                length_buckets[len(candidate)].append(position)
+            cached = {
+                "terms": terms,
+                "length_buckets": dict(length_buckets)
+            }
+            self._candidate_cache[system] = cached
+        return cached
+    
+    def _get_candidate_tokens(self, system: str) -> List[frozenset]:
+        """Get the token set of every candidate term, tokenized once per index."""
+        candidates = self._get_candidates(system)
+        if "token_sets" not in candidates:
+            candidates["token_sets"] = [
+                frozenset(self._tokenize(candidate)) for candidate in candidates["terms"]
+            ]
+        return candidates["token_sets"]
+    
+    def _ratio_candidates(self, term: str, system: str) -> List[str]:
+        """
+        Get the candidates that can reach the ratio threshold for a term.
+        
+        fuzz.ratio is at most 200 * min(a, b) / (a + b) for lengths a and b,
+        so candidates outside that length window are skipped unscored. Index
+        order is preserved so ties resolve the same as over the full list.
+        
+        Args:
+            term: The normalized query term
+            system: The terminology system
+            
+        Returns:
+            List of candidate terms
+        """
+        candidates = self._get_candidates(system)
+        cutoff = self.thresholds["ratio"]
+        query_length = len(term)
+        if not query_length or not 0 < cutoff <= 100:
+            return candidates["terms"]
+        
+        min_length = math.floor(query_length * cutoff / (200 - cutoff))
+        max_length = math.ceil(query_length * (200 - cutoff) / cutoff)
+        
+        positions = []
+        for length, bucket in candidates["length_buckets"].items():
+            if min_length <= length <= max_length:
+                positions.extend(bucket)
+        positions.sort()
+        
+        terms = candidates["terms"]
+        return [terms[position] for position in positions]
+    
+    def _find_rapidfuzz_matches(self, terms: List[str], system: str) -> List[Optional[Dict[str, Any]]]:
+        """
+        Batch version of _find_rapidfuzz_match built on process.cdist.
+        
+        Args:
+            terms: The normalized terms to match
+            system: The terminology system to search
+            
+        Returns:
+            List with a mapping dictionary or None for each term
+        """
+        if not self.term_index[system]:
+            return [None] * len(terms)
+        
+        candidates = self._get_candidates(system)["terms"]
+        
+        # Same scorers, thresholds and precedence as _find_rapidfuzz_match
+        scorers = [
+            ("ratio", fuzz.ratio, self.thresholds["ratio"]),
+            ("partial_ratio", fuzz.partial_ratio, self.thresholds["partial_ratio"]),
+            ("token_sort_ratio", fuzz.token_sort_ratio, self.thresholds["token_sort_ratio"]),
+            ("token_set_ratio", fuzz.token_set_ratio, self.thresholds["token_sort_ratio"])
+        ]
+        
+        best = [(0, None, "")] * len(terms)
+        
+        # Bound the score matrix size for large terminologies
+        chunk_size = max(1, CDIST_MAX_CELLS // len(candidates))
+        for start in range(0, len(terms), chunk_size):
+            chunk = terms[start:start + chunk_size]
+            for match_type, scorer, cutoff in scorers:
+                # float64 keeps scores identical to extractOne's for tie-breaking
+                scores = process.cdist(chunk, candidates, scorer=scorer, processor=None,
+                                       score_cutoff=cutoff, dtype=np.float64, workers=-1)
+                for offset, row in enumerate(scores):
+                    col = int(row.argmax())
+                    score = float(row[col])
+                    if score >= cutoff and score > best[start + offset][0]:
+                        best[start + offset] = (score, candidates[col], match_type)
+        
+        matches = []
+        for best_score, best_match, match_type in best:
+            if best_match is None:
+                matches.append(None)
+                continue
+            match_info = self.term_index[system][best_match]
+            matches.append({
+                "code": match_info["code"],
+                "display": match_info["display"],
+                "system": self._get_system_uri(system),
+                "found": True,
+                "match_type": match_type,
+                "score": best_score
+            })
+        return matches
+    
     def _find_basic_fuzzy_match(self, term: str, system: str, context: Optional[str] = None) -> Optional[Dict[str, Any]]:
         """
         Find the best match using built-in difflib when rapidfuzz is not available.
@@ -502,14 +737,25 @@ class FuzzyMatcher:
         best_score = 0
         best_match = None
         best_match_type = ""
+        levenshtein_threshold = self.thresholds["levenshtein"]
+        matcher = SequenceMatcher(None, term)
+        
+        terms = self._get_candidates(system)["terms"]
+        token_sets = self._get_candidate_tokens(system)
         
         # Try each term in the index
-        for db_term, match_info in self.term_index[system].items():
-            # Calculate Levenshtein similarity
-            levenshtein_score = SequenceMatcher(None, term, db_term).ratio()
+        for db_term, db_tokens in zip(terms, token_sets):
+            # Calculate Levenshtein similarity. The quick ratios are cheap upper
+            # bounds on ratio(), so skip the full alignment when it cannot win.
+            matcher.set_seq2(db_term)
+            levenshtein_score = 0
+            upper_bound = matcher.real_quick_ratio()
+            if upper_bound >= levenshtein_threshold and upper_bound > best_score:
+                upper_bound = matcher.quick_ratio()
+                if upper_bound >= levenshtein_threshold and upper_bound > best_score:
+                    levenshtein_score = matcher.ratio()
             
             # Calculate token similarity (Jaccard)
-            db_tokens = set(self._tokenize(db_term))
             if not db_tokens:
                 continue
                 
@@ -519,7 +765,7 @@ class FuzzyMatcher:
             jaccard_score = intersection / union if union > 0 else 0
             
             # Determine the best score
-            if levenshtein_score >= self.thresholds["levenshtein"] and levenshtein_score > best_score:
+            if levenshtein_score >= levenshtein_threshold and levenshtein_score > best_score:
                 best_score = levenshtein_score
                 best_match = db_term
                 best_match_type = "levenshtein"
@@ -562,8 +808,9 @@ class FuzzyMatcher:
             # Transform the query term using the system-specific vectorizer
             term_vector = self.vectorizers[system].transform([term])
             
-            # Calculate cosine similarities
-            similarities = cosine_similarity(term_vector, self.vector_matrices[system]).flatten()
+            # Rows are already L2-normalized by the vectorizer, so the dot
+            # product is the cosine similarity without re-normalizing the matrix
+            similarities = linear_kernel(term_vector, self.vector_matrices[system]).flatten()
             
             # Find the best match
             best_idx = np.argmax(similarities)
@@ -596,13 +843,13 @@ class FuzzyMatcher:
             List of tokens
         """
         # Remove punctuation
-        text = re.sub(r'[^\w\s]', ' ', text)
+        text = _NON_WORD_RE.sub(' ', text)
         
         # Tokenize
         tokens = text.lower().split()
         
         # Remove stopwords
-        tokens = [token for token in tokens if token not in self.stopwords]
+        tokens = [token for token in tokens if token not in self._stopword_set]
         
         return tokens
     
@@ -717,7 +964,7 @@ class FuzzyMatcher:
         """
         # Normalize the input term
         normalized_term = term.lower()
-        normalized_term = re.sub(r'\s+', ' ', normalized_term).strip()
+        normalized_term = _WHITESPACE_RE.sub(' ', normalized_term).strip()
         
         # Generate variants for search
         variants = self._generate_term_variations(normalized_term)
@@ -800,6 +1047,7 @@ class FuzzyMatcher:
                     # Add the new synonyms to the existing set
                     existing_set.update(syn_set)
                     self.synonyms[key] = list(existing_set)
+                    self.clear_cache()
                     
                     logger.info(f"Updated synonym set for '{term}' with {len(synonyms)} new synonyms")
                     
@@ -810,6 +1058,7 @@ class FuzzyMatcher:
             # Create a new synonym set
             new_key = f"syn_set_{len(self.synonyms) + 1}"
             self.synonyms[new_key] = list(syn_set)
+            self.clear_cache()
             
             logger.info(f"Created new synonym set for '{term}' with {len(synonyms)} synonyms")
             
@@ -1,16 +1,79 @@
 """Maps medical terms to standard terminologies."""
 
 import os
+import re
+import copy
 import json
 import logging
 import importlib.util
 import glob
-from typing import Dict, List, Optional, Any, Union
+from functools import lru_cache
+from typing import Dict, List, Optional, Any, Tuple, Union
 
 from app.standards.terminology.embedded_db import EmbeddedDatabaseManager
 
 logger = logging.getLogger(__name__)
 
+# Qualifiers stripped from the front of a term before lookup, applied in order
+NORMALIZE_PREFIXES = (
+    "history of ", "chronic ", "acute ", "suspected ", "possible ",
+    "probable ", "diagnosis of ", "patient has ", "patient with ",
+    "underlying ", "recurrent ", "documented ", "confirmed ", "active "
+)
+# Translation tables for _normalize_term: punctuation that doesn't affect
+# meaning becomes a space, and symbols are spelled out
+_PUNCTUATION_TABLE = str.maketrans({c: ' ' for c in ',.;:!?()'})
+_SYMBOL_TABLE = str.maketrans({'%': ' percent', '&': ' and '})
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# Keywords whose presence in the context marks it as a given kind of clinical
+# context; each _enhance_*_context method checks one tuple by substring
+MEDICAL_CONTEXT_KEYWORDS = (
+    "patient", "diagnosis", "medical", "health", "clinical", "disease",
+    "condition", "history", "assessment", "treatment", "healthcare",
+    "physician", "doctor", "hospital", "clinic", "symptoms"
+)
+CONDITION_CONTEXT_KEYWORDS = (
+    "diagnosis", "condition", "disease", "disorder", "syndrome", 
+    "diagnosed with", "suffers from", "presents with", "symptoms of",
+    "confirmed", "suspected", "chronic", "acute", "patient has",
+    "history of", "assessment", "impression"
+)
+PROCEDURE_CONTEXT_KEYWORDS = (
+    "procedure", "surgery", "operation", "intervention", "test", "exam",
+    "scan", "image", "performed", "underwent", "scheduled for",
+    "surgical", "diagnostic", "examination", "imaging", "treatment"
+)
+MEDICATION_CONTEXT_KEYWORDS = (
+    "medication", "drug", "dose", "dosage", "tablet", "capsule", "pill",
+    "injection", "infusion", "prescription", "mg", "mcg", "mL", "oral",
+    "intravenous", "iv", "im", "subcutaneous", "sc", "daily", "bid", "tid",
+    "taken", "prescribed", "therapy", "treatment", "administration"
+)
+LAB_TEST_CONTEXT_KEYWORDS = (
+    "laboratory", "lab", "blood test", "urine test", "serum", "plasma",
+    "sample", "specimen", "test", "assay", "analysis", "level", "concentration",
+    "chemistry", "hematology", "microbiology", "value", "elevated", "decreased",
+    "normal range", "reference range", "results", "panel", "profile"
+)
+MEASUREMENT_CONTEXT_KEYWORDS = (
+    "measurement", "measure", "assessment", "evaluate", "monitoring",
+    "value", "level", "test", "testing", "parameter", "score", "index",
+    "rate", "ratio", "concentration", "count", "percentage", "mmHg",
+    "kg", "cm", "mm", "mmol/L", "mg/dL", "g/L", "frequency", "duration"
+)
+
+# Keywords that mark a term as a laboratory test in _is_lab_term
+LAB_TERM_KEYWORDS = (
+    "test", "level", "measurement", "laboratory", "lab", "analysis",
+    "count", "profile", "panel", "assay", "culture", "titer", "screen",
+    "ratio", "blood", "serum", "plasma", "urine", "csf", "biopsy",
+    "hemoglobin", "glucose", "creatinine", "sodium", "potassium",
+    "calcium", "albumin", "bilirubin", "cholesterol", "triglyceride",
+    "ldl", "hdl", "ast", "alt", "ggt", "wbc", "rbc", "platelet",
+    "inr", "ptt", "troponin", "bnp", "tsh", "hba1c", "antibody"
+)
+
 class TerminologyMapper:
     """Terminology mapper for medical terms."""
     
@@ -25,6 +88,11 @@ class TerminologyMapper:
         self.synonyms = {}
         self.clinical_context_enhancers = {}
         
+        # Per-instance LRU cache for map_term; results are copied on the way out
+        self._map_term_cached = lru_cache(
+            maxsize=self.config.get("map_cache_size", 50000)
+        )(self._map_term_uncached)
+        
         self._setup_fuzzy_matching()
         self._setup_external_services()
         self._load_all_synonyms()
@@ -127,13 +195,8 @@ class TerminologyMapper:
     
     def _enhance_medical_context(self, term: str, mapping_result: Dict[str, Any], context: str) -> Dict[str, Any]:
         """Enhance mapping for medical context."""
-        medical_keywords = [
-            "patient", "diagnosis", "medical", "health", "clinical", "disease",
-            "condition", "history", "assessment", "treatment", "healthcare",
-            "physician", "doctor", "hospital", "clinic", "symptoms"
-        ]
-        
-        medical_context = any(kw in context.lower() for kw in medical_keywords)
+        context_lower = context.lower()
+        medical_context = any(kw in context_lower for kw in MEDICAL_CONTEXT_KEYWORDS)
         
         if medical_context:
             if "score" in mapping_result:
@@ -145,14 +208,8 @@ class TerminologyMapper:
     
     def _enhance_condition_context(self, term: str, mapping_result: Dict[str, Any], context: str) -> Dict[str, Any]:
         """Enhance mapping for condition context."""
-        condition_keywords = [
-            "diagnosis", "condition", "disease", "disorder", "syndrome", 
-            "diagnosed with", "suffers from", "presents with", "symptoms of",
-            "confirmed", "suspected", "chronic", "acute", "patient has",
-            "history of", "assessment", "impression"
-        ]
-        
-        condition_context = any(kw in context.lower() for kw in condition_keywords)
+        context_lower = context.lower()
+        condition_context = any(kw in context_lower for kw in CONDITION_CONTEXT_KEYWORDS)
         
         if condition_context:
             if "score" in mapping_result:
@@ -164,13 +221,8 @@ class TerminologyMapper:
     
     def _enhance_procedure_context(self, term: str, mapping_result: Dict[str, Any], context: str) -> Dict[str, Any]:
         """Enhance mapping for procedure context."""
-        procedure_keywords = [
-            "procedure", "surgery", "operation", "intervention", "test", "exam",
-            "scan", "image", "performed", "underwent", "scheduled for",
-            "surgical", "diagnostic", "examination", "imaging", "treatment"
-        ]
-        
-        procedure_context = any(kw in context.lower() for kw in procedure_keywords)
+        context_lower = context.lower()
+        procedure_context = any(kw in context_lower for kw in PROCEDURE_CONTEXT_KEYWORDS)
         
         if procedure_context:
             if "score" in mapping_result:
@@ -182,14 +234,8 @@ class TerminologyMapper:
     
     def _enhance_medication_context(self, term: str, mapping_result: Dict[str, Any], context: str) -> Dict[str, Any]:
         """Enhance mapping for medication context."""
-        medication_keywords = [
-            "medication", "drug", "dose", "dosage", "tablet", "capsule", "pill",
-            "injection", "infusion", "prescription", "mg", "mcg", "mL", "oral",
-            "intravenous", "iv", "im", "subcutaneous", "sc", "daily", "bid", "tid",
-            "taken", "prescribed", "therapy", "treatment", "administration"
-        ]
-        
-        medication_context = any(kw in context.lower() for kw in medication_keywords)
+        context_lower = context.lower()
+        medication_context = any(kw in context_lower for kw in MEDICATION_CONTEXT_KEYWORDS)
         
         if medication_context:
             if "score" in mapping_result:
@@ -201,15 +247,9 @@ class TerminologyMapper:
     
     def _enhance_lab_test_context(self, term: str, mapping_result: Dict[str, Any], context: str) -> Dict[str, Any]:
         """Enhance mapping for lab test context."""
-        lab_keywords = [
-            "laboratory", "lab", "blood test", "urine test", "serum", "plasma",
-            "sample", "specimen", "test", "assay", "analysis", "level", "concentration",
-            "chemistry", "hematology", "microbiology", "value", "elevated", "decreased",
-            "normal range", "reference range", "results", "panel", "profile"
-        ]
-        
         # Check if the context contains any lab test-specific keywords
-        lab_context = any(kw in context.lower() for kw in lab_keywords)
+        context_lower = context.lower()
+        lab_context = any(kw in context_lower for kw in LAB_TEST_CONTEXT_KEYWORDS)
         
         if lab_context:
             # Increase confidence score if in a lab test context
@@ -232,16 +272,9 @@ class TerminologyMapper:
         Returns:
             Enhanced mapping result
         """
-        # Check for measurement-specific keywords in the context
-        measurement_keywords = [
-            "measurement", "measure", "assessment", "evaluate", "monitoring",
-            "value", "level", "test", "testing", "parameter", "score", "index",
-            "rate", "ratio", "concentration", "count", "percentage", "mmHg",
-            "kg", "cm", "mm", "mmol/L", "mg/dL", "g/L", "frequency", "duration"
-        ]
-        
         # Check if the context contains any measurement-specific keywords
-        measurement_context = any(kw in context.lower() for kw in measurement_keywords)
+        context_lower = context.lower()
+        measurement_context = any(kw in context_lower for kw in MEASUREMENT_CONTEXT_KEYWORDS)
         
         if measurement_context:
             # Increase confidence score if in a measurement context
@@ -260,6 +293,9 @@ class TerminologyMapper:
             bool: True if initialization was successful
         """
         try:
+            # Cached results may be stale once databases and indexes are rebuilt
+            self.clear_cache()
+            
             # Connect to embedded databases
             db_success = self.db_manager.connect()
             
@@ -275,6 +311,7 @@ class TerminologyMapper:
             # Share synonyms with the fuzzy matcher
             if self.fuzzy_matcher:
                 self.fuzzy_matcher.synonyms = self.synonyms
+                self.fuzzy_matcher.clear_cache()
             
             # Log overall initialization status
             if db_success:
@@ -675,24 +712,18 @@ class TerminologyMapper:
         term = term.lower()
         
         # Remove common prefix/suffix terms that might affect matching
-        prefixes_to_remove = [
-            "history of ", "chronic ", "acute ", "suspected ", "possible ",
-            "probable ", "diagnosis of ", "patient has ", "patient with ",
-            "underlying ", "recurrent ", "documented ", "confirmed ", "active "
-        ]
-        for prefix in prefixes_to_remove:
+        for prefix in NORMALIZE_PREFIXES:
             if term.startswith(prefix):
                 term = term[len(prefix):]
         
         # Remove punctuation that doesn't affect meaning
-        import re
-        term = re.sub(r'[,.;:!?()]', ' ', term)
+        term = term.translate(_PUNCTUATION_TABLE)
         
         # Normalize whitespace
-        term = re.sub(r'\s+', ' ', term).strip()
+        term = _WHITESPACE_RE.sub(' ', term).strip()
         
         # Normalize common symbols
-        term = term.replace('%', ' percent').replace('&', ' and ')
+        term = term.translate(_SYMBOL_TABLE)
         
         return term
     
@@ -794,22 +825,12 @@ class TerminologyMapper:
         Returns:
             bool: True if the term appears to be a lab test
         """
-        lab_keywords = [
-            "test", "level", "measurement", "laboratory", "lab", "analysis",
-            "count", "profile", "panel", "assay", "culture", "titer", "screen",
-            "ratio", "blood", "serum", "plasma", "urine", "csf", "biopsy",
-            "hemoglobin", "glucose", "creatinine", "sodium", "potassium",
-            "calcium", "albumin", "bilirubin", "cholesterol", "triglyceride",
-            "ldl", "hdl", "ast", "alt", "ggt", "wbc", "rbc", "platelet",
-            "inr", "ptt", "troponin", "bnp", "tsh", "hba1c", "antibody"
-        ]
-        
         # Check for direct match with keywords
-        if any(kw == term for kw in lab_keywords):
+        if term in LAB_TERM_KEYWORDS:
             return True
         
         # Check for partial matches
-        return any(kw in term for kw in lab_keywords)
+        return any(kw in term for kw in LAB_TERM_KEYWORDS)
     
     def add_custom_mapping(self, system: str, term: str, code: str, display: str) -> bool:
         """
@@ -831,7 +852,10 @@ class TerminologyMapper:
             "found": True
         }
         
-        return self.db_manager.add_mapping(system, self._normalize_term(term), mapping)
+        added = self.db_manager.add_mapping(system, self._normalize_term(term), mapping)
+        if added:
+            self.clear_cache()
+        return added
     
     def _get_system_uri(self, system: str) -> str:
         """Get the URI for a terminology system."""
@@ -889,8 +913,49 @@ class TerminologyMapper:
                 "found": False
             }
             
+        # Serve repeated lookups from the cache; callers get their own copy
+        # so mutating a result never leaks into later lookups. An empty
+        # context maps the same as no context, so both share one entry.
+        # Lookups that may call an external API are never cached, so an
+        # outage can't pin a fallback or not-found result. Fields that echo
+        # the input are put back to the caller's spelling.
+        key_term = " ".join(term.lower().split())
+        system_key = system.lower()
+        if self._uses_external_service(system_key):
+            result = self._map_term_uncached(key_term, system_key, context or None)
+        else:
+            result = copy.deepcopy(self._map_term_cached(key_term, system_key, context or None))
+        if "original_term" in result:
+            result["original_term"] = term
+        if not result.get("found") and key_term:
+            result["display"] = term
+        return result
+    
+    def map_terms(self, pairs: List[Tuple[str, str]],
+                  context: Optional[str] = None) -> Dict[Tuple[str, str], Dict[str, Any]]:
+        """
+        Map several (term, system) pairs in one call.
+        
+        Duplicate pairs are looked up once and every lookup goes through the
+        map_term cache, so repeated entities in a document cost a single
+        database round trip.
+        
+        Args:
+            pairs: List of (term, system) tuples to map
+            context: Optional context information shared by all terms
+            
+        Returns:
+            Dictionary keyed by the (term, system) pairs with mapping results
+        """
+        results = {}
+        for term, system in pairs:
+            if (term, system) not in results:
+                results[(term, system)] = self.map_term(term, system, context)
+        return results
+    
+    def _map_term_uncached(self, term: str, system: str, context: Optional[str] = None) -> Dict[str, Any]:
+        """Route a normalized term to the mapping method for its system."""
         # Route to the appropriate mapping method
-        system = system.lower()
         if system == "snomed":
             return self.map_to_snomed(term, context)
         elif system == "loinc":
@@ -907,6 +972,36 @@ class TerminologyMapper:
                 "error": f"Unsupported terminology system: {system}"
             }
     
+    def _uses_external_service(self, system: str) -> bool:
+        """Whether mapping to a system may call an external terminology API."""
+        if not self.external_service:
+            return False
+        # RxNorm always asks the API first; SNOMED and LOINC only fall back to it
+        return system == "rxnorm" or self.config.get("use_external_services", False)
+    
+    def clear_cache(self):
+        """
+        Drop all cached map_term results.
+        
+        Only lookups answered without an external API are cached; they have
+        no expiry, so call this after the terminology data changes.
+        """
+        self._map_term_cached.cache_clear()
+    
+    def normalize_term(self, term: str) -> str:
+        """
+        Normalize a term the way the mapping methods do before lookup.
+        
+        Terms that normalize to the same string map to the same result.
+        
+        Args:
+            term: The term to normalize
+            
+        Returns:
+            Normalized term
+        """
+        return self._normalize_term(term)
+    
     def add_synonyms(self, term: str, synonyms: List[str]) -> bool:
         """
         Add synonym mappings for a term.
@@ -922,7 +1017,10 @@ class TerminologyMapper:
             logger.warning("Fuzzy matcher not available, cannot add synonyms")
             return False
             
-        return self.fuzzy_matcher.add_synonym(term, synonyms)
+        added = self.fuzzy_matcher.add_synonym(term, synonyms)
+        if added:
+            self.clear_cache()
+        return added
     
     def get_loinc_hierarchy(self, code: str, relationship_type: Optional[str] = None) -> List[Dict[str, Any]]:
         """
@@ -0,0 +1,102 @@
+"""
+Shared pytest fixtures for the backend test suite.
+"""
+
+import os
+import sys
+
+import pytest
+
+# Add backend to path so the suite doesn't depend on the working directory
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.standards.terminology.embedded_db import EmbeddedDatabaseManager
+from app.standards.terminology.mapper import TerminologyMapper
+
+SAMPLE_DATA_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'terminology', 'sample_data'
+)
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--runslow", action="store_true", default=False,
+        help="also run tests marked slow"
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", "slow: needs a running API server or is otherwise slow; skipped unless --runslow is given"
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--runslow"):
+        return
+    skip_slow = pytest.mark.skip(reason="slow test, use --runslow to run")
+    for item in items:
+        if "slow" in item.keywords:
+            item.add_marker(skip_slow)
+
+
+@pytest.fixture(scope="session")
+def terminology_data_dir(tmp_path_factory):
+    """Build the terminology databases from the bundled sample data.
+
+    The databases live in a temporary directory so test runs never create or
+    modify the ones under backend/data/terminology.
+    """
+    data_dir = tmp_path_factory.mktemp("terminology")
+    db_manager = EmbeddedDatabaseManager(str(data_dir))
+    db_manager.connect()
+    for system in ("snomed", "loinc", "rxnorm"):
+        db_manager.import_concepts(system, os.path.join(SAMPLE_DATA_DIR, f"{system}_sample.csv"))
+    db_manager.close()
+    return data_dir
+
+
+@pytest.fixture(scope="session")
+def mapper(terminology_data_dir):
+    """Create one mapper instance shared by the whole test session.
+
+    Building a TerminologyMapper connects the embedded databases, loads the
+    synonym and abbreviation files and indexes every term for fuzzy matching,
+    so it is done once. Tests only query it; a test that needs to add
+    mappings or synonyms should build its own instance.
+    """
+    instance = TerminologyMapper({"data_dir": str(terminology_data_dir)})
+    yield instance
+    instance.close()
+
+
+@pytest.fixture(scope="session")
+def document_service(tmp_path_factory):
+    """Create one DocumentService for the session in a temporary directory.
+
+    The service creates its upload directory and SQLite schema on
+    construction; sharing it keeps that to once per session and keeps test
+    files out of the working tree.
+    """
+    try:
+        from api.v1.services.document_service import DocumentService
+    except ImportError as e:
+        pytest.skip(f"Document service dependencies not installed: {e}")
+    
+    root = tmp_path_factory.mktemp("documents")
+    service = DocumentService(
+        upload_dir=str(root / "uploads"),
+        db_path=str(root / "documents.db")
+    )
+    yield service
+    service.close()
+
+
+@pytest.fixture(scope="session")
+def api_client():
+    """Create one TestClient for the API, entering its lifespan once."""
+    testclient = pytest.importorskip("fastapi.testclient")
+    from api.main import app
+    
+    with testclient.TestClient(app) as client:
+        yield client
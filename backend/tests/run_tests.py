@@ -37,7 +37,7 @@ def discover_and_run_tests(
     Returns:
         Dict containing test results and timing information
     """
-    start_time = time.time()
+    start_time = time.perf_counter()
     
     # Default to the directory containing this script
     if test_dir is None:
@@ -73,7 +73,7 @@ def discover_and_run_tests(
         test_result = test_runner.run(test_suite)
         
         # Calculate duration
-        end_time = time.time()
+        end_time = time.perf_counter()
         duration = end_time - start_time
         
         # Compile results
@@ -103,7 +103,7 @@ def discover_and_run_tests(
             'failures': 0,
             'errors': 1,
             'skipped': 0,
-            'duration': time.time() - start_time,
+            'duration': time.perf_counter() - start_time,
             'success': False,
             'error_message': str(e)
         }
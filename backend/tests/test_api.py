@@ -2,12 +2,36 @@
 """
 Simple test script to verify API endpoints are working.
 """
-import requests
+import pytest
 import json
 import time
 
+requests = pytest.importorskip("requests")
+
+# These talk to a live API server
+pytestmark = pytest.mark.slow
+
 BASE_URL = "http://localhost:8000"
 
+def wait_for_server(timeout=5.0, interval=0.05):
+    """Poll the health endpoint until the server answers or the timeout passes."""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            if requests.get(f"{BASE_URL}/health", timeout=interval * 10).ok:
+                return True
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+            pass
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(interval)
+
+@pytest.fixture(scope="module", autouse=True)
+def api_server():
+    """Wait for the API server, skipping the module if it never comes up."""
+    if not wait_for_server():
+        pytest.skip(f"API server not reachable at {BASE_URL}")
+
 def test_health_check():
     """Test health check endpoint."""
     print("Testing health check...")
@@ -88,8 +112,11 @@ def main():
     print("Testing Medical Terminology Mapper API")
     print("=" * 50)
     
-    # Wait a moment for server to be ready
-    time.sleep(1)
+    # Wait for the server to be ready
+    if not wait_for_server():
+        print("ERROR: Could not connect to API. Make sure the server is running.")
+        print("Run: python run_api.py")
+        return
     
     try:
         test_health_check()
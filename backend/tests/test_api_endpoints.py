@@ -1,37 +1,27 @@
 """Test API endpoints for the Medical Terminology Mapper API."""
 import pytest
-from fastapi.testclient import TestClient
-import sys
-import os
 
-# Add parent directory to path
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-from api.main import app
-
-client = TestClient(app)
-
-def test_root_endpoint():
+def test_root_endpoint(api_client):
     """Test root endpoint."""
-    response = client.get("/")
+    response = api_client.get("/")
     assert response.status_code == 200
     data = response.json()
     assert "message" in data
     assert "version" in data
     assert "docs" in data
 
-def test_health_check():
+def test_health_check(api_client):
     """Test health check endpoint."""
-    response = client.get("/api/v1/health")
+    response = api_client.get("/api/v1/health")
     assert response.status_code == 200
     data = response.json()
     assert data["status"] == "healthy"
     assert "service" in data
     assert "version" in data
 
-def test_get_systems():
+def test_get_systems(api_client):
     """Test systems endpoint."""
-    response = client.get("/api/v1/systems")
+    response = api_client.get("/api/v1/systems")
     assert response.status_code == 200
     data = response.json()
     assert "systems" in data
@@ -44,9 +34,9 @@ def test_get_systems():
     assert "description" in system
     assert "supported" in system
 
-def test_get_fuzzy_algorithms():
+def test_get_fuzzy_algorithms(api_client):
     """Test fuzzy algorithms endpoint."""
-    response = client.get("/api/v1/fuzzy-algorithms")
+    response = api_client.get("/api/v1/fuzzy-algorithms")
     assert response.status_code == 200
     data = response.json()
     assert "algorithms" in data
@@ -59,7 +49,7 @@ def test_get_fuzzy_algorithms():
     assert "description" in algo
     assert "best_for" in algo
 
-def test_map_term_post():
+def test_map_term_post(api_client):
     """Test term mapping with POST."""
     request_data = {
         "term": "diabetes",
@@ -68,7 +58,7 @@ def test_map_term_post():
         "max_results": 5
     }
     
-    response = client.post("/api/v1/map", json=request_data)
+    response = api_client.post("/api/v1/map", json=request_data)
     assert response.status_code == 200
     data = response.json()
     
@@ -78,9 +68,9 @@ def test_map_term_post():
     assert "total_matches" in data
     assert "processing_time_ms" in data
 
-def test_map_term_get():
+def test_map_term_get(api_client):
     """Test term mapping with GET."""
-    response = client.get("/api/v1/map?term=hypertension&systems=snomed&max_results=3")
+    response = api_client.get("/api/v1/map?term=hypertension&systems=snomed&max_results=3")
     assert response.status_code == 200
     data = response.json()
     
@@ -89,7 +79,7 @@ def test_map_term_get():
     assert "results" in data
     assert "processing_time_ms" in data
 
-def test_batch_mapping():
+def test_batch_mapping(api_client):
     """Test batch mapping endpoint."""
     request_data = {
         "terms": ["diabetes", "hypertension", "aspirin"],
@@ -97,7 +87,7 @@ def test_batch_mapping():
         "max_results_per_term": 3
     }
     
-    response = client.post("/api/v1/batch", json=request_data)
+    response = api_client.post("/api/v1/batch", json=request_data)
     assert response.status_code == 200
     data = response.json()
     
@@ -115,19 +105,19 @@ def test_batch_mapping():
         assert "results" in result
         assert "total_matches" in result
 
-def test_invalid_term_mapping():
+def test_invalid_term_mapping(api_client):
     """Test mapping with invalid parameters."""
     request_data = {
         "term": "",  # Empty term
         "systems": ["snomed"]
     }
     
-    response = client.post("/api/v1/map", json=request_data)
+    response = api_client.post("/api/v1/map", json=request_data)
     assert response.status_code == 422  # Validation error
 
-def test_statistics_endpoint():
+def test_statistics_endpoint(api_client):
     """Test statistics endpoint."""
-    response = client.get("/api/v1/statistics")
+    response = api_client.get("/api/v1/statistics")
     assert response.status_code == 200
     data = response.json()
     
@@ -135,7 +125,7 @@ def test_statistics_endpoint():
     assert "cache_status" in data
     assert "performance" in data
 
-def test_context_aware_mapping():
+def test_context_aware_mapping(api_client):
     """Test term mapping with context."""
     request_data = {
         "term": "glucose",
@@ -144,7 +134,7 @@ def test_context_aware_mapping():
         "max_results": 5
     }
     
-    response = client.post("/api/v1/map", json=request_data)
+    response = api_client.post("/api/v1/map", json=request_data)
     assert response.status_code == 200
     data = response.json()
     
@@ -152,7 +142,7 @@ def test_context_aware_mapping():
     assert "results" in data
     # Context should potentially improve results
 
-def test_multiple_systems_mapping():
+def test_multiple_systems_mapping(api_client):
     """Test mapping across multiple systems."""
     request_data = {
         "term": "insulin",
@@ -160,14 +150,14 @@ def test_multiple_systems_mapping():
         "max_results": 3
     }
     
-    response = client.post("/api/v1/map", json=request_data)
+    response = api_client.post("/api/v1/map", json=request_data)
     assert response.status_code == 200
     data = response.json()
     
     assert "results" in data
     # Should have results from multiple systems if available
 
-def test_fuzzy_algorithm_selection():
+def test_fuzzy_algorithm_selection(api_client):
     """Test specific fuzzy algorithm selection."""
     request_data = {
         "term": "diabetis",  # Misspelled
@@ -177,7 +167,7 @@ def test_fuzzy_algorithm_selection():
         "max_results": 5
     }
     
-    response = client.post("/api/v1/map", json=request_data)
+    response = api_client.post("/api/v1/map", json=request_data)
     assert response.status_code == 200
     data = response.json()
     
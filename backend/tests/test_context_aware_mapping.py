@@ -7,13 +7,20 @@ detection, context modifier recognition, and semantic scoring.
 """
 
 import os
+import re
 import sys
+import threading
 import unittest
+from dataclasses import FrozenInstanceError
+from types import SimpleNamespace
 from unittest.mock import Mock, patch
 
+import pytest
+
 # Add project root to Python path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from app.standards.terminology import context_aware_mapper
 from app.standards.terminology.context_aware_mapper import (
     ContextAwareTerminologyMapper,
     ClinicalDomain,
@@ -21,33 +28,59 @@ from app.standards.terminology.context_aware_mapper import (
     ClinicalContext,
     ContextAwareMapping
 )
-from app.standards.terminology.mapper import TerminologyMapper
+
+NO_MATCH = {
+    'found': False,
+    'system': None,
+    'code': None,
+    'display': None,
+    'confidence': 0.0,
+    'match_type': 'no_match'
+}
 
 
 class TestContextAwareMapping(unittest.TestCase):
     """Test context-aware mapping functionality."""
     
-    def setUp(self):
-        """Set up test fixtures."""
-        # Create mock base mapper
-        self.mock_base_mapper = Mock(spec=TerminologyMapper)
-        
-        # Configure mock responses
-        self.mock_base_mapper.map_term.return_value = {
-            'found': True,
-            'system': 'http://snomed.info/sct',
-            'code': '38341003',
-            'display': 'Hypertensive disorder',
-            'confidence': 0.9,
-            'match_type': 'exact'
-        }
+    @classmethod
+    def setUpClass(cls):
+        """Set up one mock base mapper and context-aware mapper for the class.
+        
+        The base mapper is a plain namespace holding only what the
+        context-aware mapper calls; tests that change it go through
+        _patch_mock so the change is undone when the test finishes.
+        """
+        # Create mock base mapper: SNOMED finds hypertension, the others miss
+        cls.mock_base_mapper = SimpleNamespace(
+            map_to_snomed=Mock(return_value={
+                'found': True,
+                'system': 'http://snomed.info/sct',
+                'code': '38341003',
+                'display': 'Hypertensive disorder',
+                'confidence': 0.9,
+                'match_type': 'exact'
+            }),
+            map_to_loinc=Mock(return_value=NO_MATCH),
+            map_to_rxnorm=Mock(return_value=NO_MATCH),
+            fuzzy_matcher=None
+        )
         
         # Create context-aware mapper
-        self.mapper = ContextAwareTerminologyMapper(
-            base_mapper=self.mock_base_mapper,
+        cls.mapper = ContextAwareTerminologyMapper(
+            base_mapper=cls.mock_base_mapper,
             config={'enable_context_aware': True}
         )
     
+    def _patch_mock(self, target, attribute, value):
+        """Set an attribute on the shared mock for the current test only."""
+        try:
+            previous = getattr(target, attribute)
+        except AttributeError:
+            self.addCleanup(delattr, target, attribute)
+        else:
+            self.addCleanup(setattr, target, attribute, previous)
+        setattr(target, attribute, value)
+    
     def test_clinical_domain_detection(self):
         """Test clinical domain detection from context."""
         # Test cardiology domain
@@ -104,6 +137,40 @@ class TestContextAwareMapping(unittest.TestCase):
         )
         self.assertIn(ContextModifier.CURRENT, context.modifiers)
     
+    def test_compound_context_modifiers(self):
+        """Test that every modifier class is detected in one compound sentence."""
+        context = self.mapper._detect_clinical_context(
+            "chest pain",
+            "history of angina, currently denies chest pain, possibly reflux"
+        )
+        
+        self.assertEqual(context.modifiers, [
+            ContextModifier.NEGATION,
+            ContextModifier.UNCERTAINTY,
+            ContextModifier.PAST_HISTORY,
+            ContextModifier.CURRENT
+        ])
+    
+    def test_shared_modifier_words(self):
+        """Test that a word belonging to several modifier classes counts for each."""
+        context = self.mapper._detect_clinical_context("pain", "ongoing pain")
+        self.assertEqual(context.modifiers, [ContextModifier.CURRENT, ContextModifier.CHRONIC])
+        
+        context = self.mapper._detect_clinical_context("embolism", "rule out embolism")
+        self.assertEqual(context.modifiers, [ContextModifier.NEGATION, ContextModifier.UNCERTAINTY])
+    
+    def test_context_detection_is_cached(self):
+        """Test that repeated context text reuses cached detection results."""
+        mapper = ContextAwareTerminologyMapper(base_mapper=self.mock_base_mapper)
+        
+        first = mapper._detect_clinical_context("asthma", "currently no wheezing")
+        second = mapper._detect_clinical_context("asthma", "currently no wheezing")
+        
+        self.assertEqual(first.modifiers, second.modifiers)
+        self.assertIsNot(first.modifiers, second.modifiers)
+        self.assertEqual(mapper._detect_modifiers_cached.cache_info().hits, 1)
+        self.assertEqual(mapper._detect_domain_cached.cache_info().hits, 1)
+    
     def test_semantic_context_extraction(self):
         """Test semantic context extraction."""
         semantic_context = self.mapper._extract_semantic_context(
@@ -159,14 +226,15 @@ class TestContextAwareMapping(unittest.TestCase):
     def test_domain_specific_enhancement(self):
         """Test domain-specific mapping enhancement."""
         # Mock LOINC result for laboratory domain
-        self.mock_base_mapper.map_term.return_value = {
+        self._patch_mock(self.mock_base_mapper.map_to_snomed, 'return_value', NO_MATCH)
+        self._patch_mock(self.mock_base_mapper.map_to_loinc, 'return_value', {
             'found': True,
             'system': 'http://loinc.org',
             'code': '2339-0',
             'display': 'Glucose [Mass/volume] in Blood',
             'confidence': 0.8,
             'match_type': 'exact'
-        }
+        })
         
         result = self.mapper.map_with_context(
             "glucose",
@@ -198,6 +266,98 @@ class TestContextAwareMapping(unittest.TestCase):
         self.assertTrue(all(isinstance(r, ContextAwareMapping) for r in results))
         self.assertTrue(all(r.clinical_context.domain == ClinicalDomain.CARDIOLOGY for r in results))
     
+    def test_batch_parallel_preserves_order(self):
+        """Test that a threaded batch maps terms concurrently and keeps order."""
+        terms = ["hypertension", "diabetes", "asthma"]
+        # Every lookup waits until all three are in flight, so a serial
+        # batch would time out here and return error results instead
+        barrier = threading.Barrier(len(terms), timeout=5)
+        
+        def map_to_snomed(term, context):
+            barrier.wait()
+            return {'found': True, 'system': 'http://snomed.info/sct',
+                    'code': term, 'display': term, 'confidence': 0.9,
+                    'match_type': 'exact'}
+        
+        base_mapper = Mock()
+        base_mapper.map_to_snomed.side_effect = map_to_snomed
+        base_mapper.map_to_loinc.return_value = {'found': False}
+        base_mapper.map_to_rxnorm.return_value = {'found': False}
+        base_mapper.fuzzy_matcher = None
+        mapper = ContextAwareTerminologyMapper(
+            base_mapper=base_mapper,
+            config={'batch_threads': len(terms)}
+        )
+        
+        results = mapper.batch_map_with_context([(term, "") for term in terms])
+        
+        self.assertTrue(all(r.found for r in results))
+        self.assertEqual([r.code for r in results], terms)
+    
+    def test_batch_uses_precompiled_patterns(self):
+        """Test that batch mapping runs the module's compiled patterns."""
+        terms_with_context = [
+            ("hypertension", "patient has no history of elevated blood pressure"),
+            ("glucose", "blood glucose level is 150 mg/dl"),
+            ("asthma", "possibly chronic asthma, currently on inhaler")
+        ] * 34
+        self.assertIsInstance(context_aware_mapper.MODIFIER_PATTERN, re.Pattern)
+        self.assertTrue(all(isinstance(pattern, re.Pattern)
+                            for pattern in context_aware_mapper.DOMAIN_PATTERNS.values()))
+        
+        # Spy on the compiled patterns; the mapper picks up DOMAIN_PATTERNS
+        # when it is built, and a fresh one has cold detector caches
+        modifier_spy = Mock(wraps=context_aware_mapper.MODIFIER_PATTERN)
+        domain_spies = {domain: Mock(wraps=pattern)
+                        for domain, pattern in context_aware_mapper.DOMAIN_PATTERNS.items()}
+        with patch.object(context_aware_mapper, 'MODIFIER_PATTERN', modifier_spy), \
+                patch.object(context_aware_mapper, 'DOMAIN_PATTERNS', domain_spies):
+            mapper = ContextAwareTerminologyMapper(base_mapper=self.mock_base_mapper)
+            results = mapper.batch_map_with_context(terms_with_context)
+        
+        self.assertEqual(len(results), len(terms_with_context))
+        unspied = self.mapper.batch_map_with_context(terms_with_context[:3])
+        self.assertEqual([r.clinical_context for r in results[:3]],
+                         [r.clinical_context for r in unspied])
+        # Each distinct text is scanned once; repeats come from the caches
+        self.assertEqual(modifier_spy.finditer.call_count, 3)
+        self.assertTrue(all(spy.findall.call_count == 3 for spy in domain_spies.values()))
+    
+    def test_system_lookups_use_module_constants(self):
+        """Test that system names and relevant domains come from the module constants."""
+        fuzzy_matcher = Mock()
+        fuzzy_matcher.find_fuzzy_match.return_value = None
+        self._patch_mock(self.mock_base_mapper, 'fuzzy_matcher', fuzzy_matcher)
+        clinical_context = ClinicalContext(
+            domain=ClinicalDomain.CARDIOLOGY,
+            modifiers=[],
+            surrounding_text="cardiac history",
+            confidence=0.8,
+            semantic_context={}
+        )
+        
+        with patch.object(context_aware_mapper, 'SYSTEM_NAMES',
+                          {'http://snomed.info/sct': 'snomed-short'}):
+            self.mapper._context_aware_fallback_mapping("angina", clinical_context, "cardiac history")
+        fuzzy_matcher.find_fuzzy_match.assert_called_once_with(
+            "angina", system='snomed-short', context="cardiac history"
+        )
+        
+        general_context = ClinicalContext(
+            domain=ClinicalDomain.GENERAL,
+            modifiers=[],
+            surrounding_text="",
+            confidence=0.5,
+            semantic_context={}
+        )
+        snomed_mapping = {'found': True, 'system': 'http://snomed.info/sct'}
+        self.assertEqual(self.mapper._calculate_domain_relevance(snomed_mapping, general_context), 0.5)
+        with patch.object(context_aware_mapper, 'SNOMED_RELEVANT_DOMAINS',
+                          frozenset({ClinicalDomain.GENERAL})):
+            self.assertEqual(
+                self.mapper._calculate_domain_relevance(snomed_mapping, general_context), 0.85
+            )
+    
     def test_context_statistics(self):
         """Test context mapping statistics."""
         # Create sample mappings
@@ -258,10 +418,9 @@ class TestContextAwareMapping(unittest.TestCase):
     
     def test_alternative_mappings(self):
         """Test alternative mapping generation."""
-        # Mock fuzzy matcher
-        mock_fuzzy_matcher = Mock()
-        mock_fuzzy_matcher.find_similar_terms.return_value = [
-            {
+        # Mock fuzzy matcher: one alternative per system, none for RxNorm
+        fuzzy_matches = {
+            'snomed': {
                 'found': True,
                 'system': 'http://snomed.info/sct',
                 'code': '123456',
@@ -269,7 +428,7 @@ class TestContextAwareMapping(unittest.TestCase):
                 'confidence': 0.7,
                 'match_type': 'fuzzy'
             },
-            {
+            'loinc': {
                 'found': True,
                 'system': 'http://loinc.org',
                 'code': '789012',
@@ -277,9 +436,13 @@ class TestContextAwareMapping(unittest.TestCase):
                 'confidence': 0.6,
                 'match_type': 'fuzzy'
             }
-        ]
+        }
+        mock_fuzzy_matcher = Mock()
+        mock_fuzzy_matcher.find_fuzzy_match.side_effect = (
+            lambda term, system, **kwargs: dict(fuzzy_matches[system]) if system in fuzzy_matches else None
+        )
         
-        self.mock_base_mapper.fuzzy_matcher = mock_fuzzy_matcher
+        self._patch_mock(self.mock_base_mapper, 'fuzzy_matcher', mock_fuzzy_matcher)
         
         result = self.mapper.map_with_context(
             "hypertension",
@@ -288,7 +451,7 @@ class TestContextAwareMapping(unittest.TestCase):
         )
         
         self.assertIsInstance(result, ContextAwareMapping)
-        self.assertTrue(len(result.alternative_mappings) > 0)
+        self.assertEqual({alt['code'] for alt in result.alternative_mappings}, {'123456', '789012'})
         # Alternatives should have context_relevance scores
         for alt in result.alternative_mappings:
             self.assertIn('context_relevance', alt)
@@ -296,14 +459,7 @@ class TestContextAwareMapping(unittest.TestCase):
     def test_fallback_mapping(self):
         """Test context-aware fallback mapping when primary mapping fails."""
         # Mock base mapper to return no match
-        self.mock_base_mapper.map_term.return_value = {
-            'found': False,
-            'system': None,
-            'code': None,
-            'display': None,
-            'confidence': 0.0,
-            'match_type': 'no_match'
-        }
+        self._patch_mock(self.mock_base_mapper.map_to_snomed, 'return_value', NO_MATCH)
         
         # Mock fuzzy matcher to provide fallback
         mock_fuzzy_matcher = Mock()
@@ -318,7 +474,7 @@ class TestContextAwareMapping(unittest.TestCase):
             }
         ]
         
-        self.mock_base_mapper.fuzzy_matcher = mock_fuzzy_matcher
+        self._patch_mock(self.mock_base_mapper, 'fuzzy_matcher', mock_fuzzy_matcher)
         
         result = self.mapper.map_with_context(
             "rare_condition",
@@ -351,7 +507,7 @@ class TestContextAwareMapping(unittest.TestCase):
     def test_error_handling(self):
         """Test error handling in context-aware mapping."""
         # Mock base mapper to raise exception
-        self.mock_base_mapper.map_term.side_effect = Exception("Test error")
+        self._patch_mock(self.mock_base_mapper.map_to_snomed, 'side_effect', Exception("Test error"))
         
         result = self.mapper.map_with_context(
             "test_term",
@@ -382,6 +538,35 @@ class TestClinicalContext(unittest.TestCase):
         self.assertIn(ContextModifier.NEGATION, context.modifiers)
         self.assertEqual(context.confidence, 0.8)
     
+    def test_context_results_are_slotted_and_frozen(self):
+        """Test that context results carry no __dict__ and can't be modified."""
+        context = ClinicalContext(
+            domain=ClinicalDomain.GENERAL,
+            modifiers=[],
+            surrounding_text="",
+            confidence=0.5,
+            semantic_context={}
+        )
+        mapping = ContextAwareMapping(
+            original_text="term",
+            found=False,
+            system=None,
+            code=None,
+            display=None,
+            confidence=0.0,
+            match_type="no_match",
+            clinical_context=context,
+            context_score=0.0,
+            semantic_score=0.0,
+            domain_relevance=0.0,
+            alternative_mappings=[]
+        )
+        
+        self.assertFalse(hasattr(context, '__dict__'))
+        self.assertFalse(hasattr(mapping, '__dict__'))
+        with self.assertRaises(FrozenInstanceError):
+            mapping.confidence = 1.0
+    
     def test_clinical_context_validation(self):
         """Test ClinicalContext validation."""
         # Invalid confidence should raise error
@@ -404,6 +589,40 @@ class TestClinicalContext(unittest.TestCase):
             )
 
 
+class TestThreadedBatchMapping(unittest.TestCase):
+    """Test threaded batch mapping against a real TerminologyMapper."""
+    
+    @pytest.fixture(autouse=True)
+    def _use_session_mapper(self, mapper):
+        """Use the session TerminologyMapper built on the sample databases."""
+        self.base_mapper = mapper
+    
+    def test_threaded_batch_matches_serial(self):
+        """Test that worker threads can query the embedded databases."""
+        terms_with_context = [
+            ("hypertension", "history of elevated blood pressure"),
+            ("glucose", "blood glucose level is 150 mg/dl"),
+            ("metformin", "currently taking metformin"),
+            ("asthma", "chronic asthma, on inhaler"),
+        ] * 4
+        serial = ContextAwareTerminologyMapper(base_mapper=self.base_mapper)
+        threaded = ContextAwareTerminologyMapper(
+            base_mapper=self.base_mapper,
+            config={'batch_threads': 4}
+        )
+        
+        # Clear the map_term cache first so the workers reach the databases
+        self.base_mapper.clear_cache()
+        results = threaded.batch_map_with_context(terms_with_context)
+        expected = serial.batch_map_with_context(terms_with_context)
+        
+        self.assertTrue(all(r.found for r in expected))
+        # Failed database lookups would fall back to fuzzy matches, so
+        # compare how each term matched as well as what it matched
+        self.assertEqual([(r.found, r.system, r.code, r.match_type) for r in results],
+                         [(r.found, r.system, r.code, r.match_type) for r in expected])
+
+
 class TestEnums(unittest.TestCase):
     """Test enum definitions."""
     
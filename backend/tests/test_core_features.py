@@ -13,9 +13,23 @@ import unittest
 # Add parent directory to the path to allow imports
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
+class MockDBManager:
+    """Minimal database manager with no terminology connections."""
+    
+    def __init__(self):
+        self.connections = {}
+
+
 class TestCoreFunctionality(unittest.TestCase):
     """Test core functionality of the application."""
     
+    @classmethod
+    def setUpClass(cls):
+        """Create one FuzzyMatcher shared by the tests; none of them modify it."""
+        from app.standards.terminology.fuzzy_matcher import FuzzyMatcher
+        
+        cls.fuzzy_matcher = FuzzyMatcher(MockDBManager())
+    
     def test_import_paths(self):
         """Ensure that core modules can be imported."""
         try:
@@ -34,15 +48,7 @@ class TestCoreFunctionality(unittest.TestCase):
     
     def test_fuzzy_matcher_creation(self):
         """Test that a FuzzyMatcher instance can be created."""
-        from app.standards.terminology.fuzzy_matcher import FuzzyMatcher
-        
-        # Create a minimal mock database manager
-        class MockDBManager:
-            def __init__(self):
-                self.connections = {}
-        
-        db_manager = MockDBManager()
-        fuzzy_matcher = FuzzyMatcher(db_manager)
+        fuzzy_matcher = self.fuzzy_matcher
         
         # Check attributes
         self.assertTrue(hasattr(fuzzy_matcher, 'term_index'))
@@ -55,15 +61,7 @@ class TestCoreFunctionality(unittest.TestCase):
     
     def test_term_variations(self):
         """Test term variation generation."""
-        from app.standards.terminology.fuzzy_matcher import FuzzyMatcher
-        
-        # Create a minimal mock database manager
-        class MockDBManager:
-            def __init__(self):
-                self.connections = {}
-        
-        db_manager = MockDBManager()
-        fuzzy_matcher = FuzzyMatcher(db_manager)
+        fuzzy_matcher = self.fuzzy_matcher
         
         # Test basic variations
         variations = fuzzy_matcher._generate_term_variations("diabetes")
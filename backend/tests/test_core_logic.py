@@ -2,95 +2,71 @@
 Test core logic without external dependencies
 """
 import re
-import os
-import sys
-from pathlib import Path
 import math
 
-# Add backend to path
-BACKEND_DIR = Path(__file__).parent.parent
-sys.path.insert(0, str(BACKEND_DIR))
-
-def test_entity_patterns():
-    """Test regex patterns for medical entities"""
-    print("Testing medical entity patterns...")
-    
-    # Dosage patterns
-    dosage_patterns = [
-        re.compile(r'\b\d+\s*(?:mg|g|mcg|ug|ml|cc|units?|iu)\b', re.I),
-        re.compile(r'\b\d+\s*(?:-|to)\s*\d+\s*(?:mg|g|mcg|ug|ml|cc|units?|iu)\b', re.I),
-    ]
-    
-    dosage_tests = [
-        ("metformin 500mg", True),
-        ("insulin 10 units", True),
-        ("aspirin 81mg", True),
-        ("10-20mg daily", True),
-        ("no dosage here", False),
-    ]
-    
-    # Frequency patterns
-    frequency_patterns = [
-        re.compile(r'\b(?:once|twice|three\s+times|four\s+times)\s+(?:a\s+)?(?:day|daily|week|weekly|month|monthly)\b', re.I),
-        re.compile(r'\b(?:q|every)\s*\d+\s*(?:h|hr|hrs|hours?|d|days?|w|wk|weeks?|mo|months?)\b', re.I),
-        re.compile(r'\b(?:bid|tid|qid|qd|qod|prn|ac|pc|hs)\b', re.I),
-    ]
-    
-    frequency_tests = [
-        ("twice daily", True),
-        ("q6h", True),
-        ("tid", True),
-        ("3 times per day", False),  # This pattern not included
-        ("once a week", True),
-        ("no frequency", False),
-    ]
-    
-    # Negation patterns
-    negation_patterns = [
-        re.compile(r'\bno\s+(?:evidence|signs?|symptoms?|history)\s+of\b', re.I),
-        re.compile(r'\bdenies?\b', re.I),
-        re.compile(r'\bnegative\s+for\b', re.I),
-        re.compile(r'\bwithout\b', re.I),
-    ]
-    
-    negation_tests = [
-        ("Patient denies chest pain", True),
-        ("No evidence of diabetes", True),
-        ("Negative for COVID-19", True),
-        ("Patient has diabetes", False),
-        ("Chest pain present", False),
-    ]
-    
-    # Test dosage patterns
-    dosage_results = []
-    for text, expected in dosage_tests:
-        found = any(pattern.search(text) for pattern in dosage_patterns)
-        dosage_results.append(found == expected)
-        print(f"  Dosage '{text}': {'✓' if found == expected else '✗'}")
-    
-    # Test frequency patterns
-    frequency_results = []
-    for text, expected in frequency_tests:
-        found = any(pattern.search(text) for pattern in frequency_patterns)
-        frequency_results.append(found == expected)
-        print(f"  Frequency '{text}': {'✓' if found == expected else '✗'}")
-    
-    # Test negation patterns
-    negation_results = []
-    for text, expected in negation_tests:
-        found = any(pattern.search(text) for pattern in negation_patterns)
-        negation_results.append(found == expected)
-        print(f"  Negation '{text}': {'✓' if found == expected else '✗'}")
-    
-    all_passed = all(dosage_results + frequency_results + negation_results)
-    print(f"Entity patterns: {'✓ PASSED' if all_passed else '✗ FAILED'}")
-    return all_passed
+import pytest
+
+# Dosage patterns
+DOSAGE_PATTERNS = [
+    re.compile(r'\b\d+\s*(?:mg|g|mcg|ug|ml|cc|units?|iu)\b', re.I),
+    re.compile(r'\b\d+\s*(?:-|to)\s*\d+\s*(?:mg|g|mcg|ug|ml|cc|units?|iu)\b', re.I),
+]
+
+# Frequency patterns
+FREQUENCY_PATTERNS = [
+    re.compile(r'\b(?:once|twice|three\s+times|four\s+times)\s+(?:a\s+)?(?:day|daily|week|weekly|month|monthly)\b', re.I),
+    re.compile(r'\b(?:q|every)\s*\d+\s*(?:h|hr|hrs|hours?|d|days?|w|wk|weeks?|mo|months?)\b', re.I),
+    re.compile(r'\b(?:bid|tid|qid|qd|qod|prn|ac|pc|hs)\b', re.I),
+]
+
+# Negation patterns
+NEGATION_PATTERNS = [
+    re.compile(r'\bno\s+(?:evidence|signs?|symptoms?|history)\s+of\b', re.I),
+    re.compile(r'\bdenies?\b', re.I),
+    re.compile(r'\bnegative\s+for\b', re.I),
+    re.compile(r'\bwithout\b', re.I),
+]
+
+
+@pytest.mark.parametrize("text,expected", [
+    ("metformin 500mg", True),
+    ("insulin 10 units", True),
+    ("aspirin 81mg", True),
+    ("10-20mg daily", True),
+    ("no dosage here", False),
+])
+def test_dosage_patterns(text, expected):
+    """Test regex patterns for dosages"""
+    assert any(pattern.search(text) for pattern in DOSAGE_PATTERNS) == expected
+
+
+@pytest.mark.parametrize("text,expected", [
+    ("twice daily", True),
+    ("q6h", True),
+    ("tid", True),
+    ("3 times per day", False),  # This pattern not included
+    ("once a week", True),
+    ("no frequency", False),
+])
+def test_frequency_patterns(text, expected):
+    """Test regex patterns for frequencies"""
+    assert any(pattern.search(text) for pattern in FREQUENCY_PATTERNS) == expected
+
+
+@pytest.mark.parametrize("text,expected", [
+    ("Patient denies chest pain", True),
+    ("No evidence of diabetes", True),
+    ("Negative for COVID-19", True),
+    ("Patient has diabetes", False),
+    ("Chest pain present", False),
+])
+def test_negation_patterns(text, expected):
+    """Test regex patterns for negations"""
+    assert any(pattern.search(text) for pattern in NEGATION_PATTERNS) == expected
 
 
 def test_confidence_calibration():
     """Test confidence calibration logic"""
-    print("\nTesting confidence calibration...")
-    
     def calibrate_score(score, temperature=1.5):
         # Convert to logit, apply temperature, convert back
         logit = math.log(score / (1 - score + 1e-8))
@@ -99,31 +75,19 @@ def test_confidence_calibration():
     
     test_cases = [
         (0.95, 1.5),  # High confidence should be reduced
-        (0.55, 1.5),  # Low confidence should be increased
+        (0.55, 1.5),  # Borderline confidence should move toward 0.5
         (0.8, 2.0),   # Different temperature
     ]
     
-    results = []
     for score, temp in test_cases:
         calibrated = calibrate_score(score, temp)
         
-        if score > 0.7:  # High confidence
-            correct = calibrated < score
-        else:  # Low confidence
-            correct = calibrated > score
-        
-        results.append(correct)
-        print(f"  {score} -> {calibrated:.3f} (temp={temp}): {'✓' if correct else '✗'}")
-    
-    all_passed = all(results)
-    print(f"Confidence calibration: {'✓ PASSED' if all_passed else '✗ FAILED'}")
-    return all_passed
+        # Temperature scaling pulls every score toward 0.5
+        assert abs(calibrated - 0.5) < abs(score - 0.5), f"{score} -> {calibrated:.3f} (temp={temp})"
 
 
 def test_entity_types():
     """Test entity type enumeration"""
-    print("\nTesting entity types...")
-    
     # Simulate EntityType enum
     class EntityType:
         CONDITION = "CONDITION"
@@ -146,18 +110,11 @@ def test_entity_types():
     available_types = EntityType.all_types()
     missing_types = [t for t in required_types if t not in available_types]
     
-    all_passed = len(missing_types) == 0
-    print(f"  Required types: {len(required_types)}")
-    print(f"  Available types: {len(available_types)}")
-    print(f"  Missing types: {missing_types}")
-    print(f"Entity types: {'✓ PASSED' if all_passed else '✗ FAILED'}")
-    return all_passed
+    assert not missing_types, f"Missing types: {missing_types}"
 
 
 def test_text_processing():
     """Test text processing functions"""
-    print("\nTesting text processing...")
-    
     def clean_text(text):
         """Simple text cleaning"""
         # Remove extra whitespace
@@ -184,21 +141,12 @@ def test_text_processing():
     context = extract_context(cleaned, entity_start, entity_end, 20)
     context_ok = "diabetes" in context and len(context) <= len(cleaned)
     
-    print(f"  Original: {test_text}")
-    print(f"  Cleaned: {cleaned}")
-    print(f"  Context: {context}")
-    print(f"  Cleaning: {'✓' if cleaning_ok else '✗'}")
-    print(f"  Context: {'✓' if context_ok else '✗'}")
-    
-    all_passed = cleaning_ok and context_ok
-    print(f"Text processing: {'✓ PASSED' if all_passed else '✗ FAILED'}")
-    return all_passed
+    assert cleaning_ok, f"Unexpected cleaned text: {cleaned}"
+    assert context_ok, f"Unexpected context: {context}"
 
 
 def test_entity_merging():
     """Test entity merging logic"""
-    print("\nTesting entity merging...")
-    
     class MockEntity:
         def __init__(self, text, start, end, confidence, source="test"):
             self.text = text
@@ -247,21 +195,12 @@ def test_entity_merging():
     # First entity should be "diabetes mellitus" (higher confidence)
     first_ok = merged[0].text == "diabetes mellitus"
     
-    print(f"  Original entities: {len(entities)}")
-    print(f"  Merged entities: {len(merged)}")
-    print(f"  First entity: {merged[0].text}")
-    print(f"  Merge count: {'✓' if merge_ok else '✗'}")
-    print(f"  First entity: {'✓' if first_ok else '✗'}")
-    
-    all_passed = merge_ok and first_ok
-    print(f"Entity merging: {'✓ PASSED' if all_passed else '✗ FAILED'}")
-    return all_passed
+    assert merge_ok, f"Expected 3 merged entities, got {len(merged)}"
+    assert first_ok, f"Unexpected first entity: {merged[0].text}"
 
 
 def test_sliding_window():
     """Test sliding window logic"""
-    print("\nTesting sliding window...")
-    
     def create_windows(text, window_size=100, overlap=20):
         """Create sliding windows from text"""
         windows = []
@@ -299,73 +238,9 @@ def test_sliding_window():
             overlap_ok = False
             break
     
-    print(f"  Text length: {len(long_text)}")
-    print(f"  Windows created: {len(windows)}")
-    print(f"  Window count: {'✓' if window_count_ok else '✗'}")
-    print(f"  Overlap check: {'✓' if overlap_ok else '✗'}")
-    
-    all_passed = window_count_ok and overlap_ok
-    print(f"Sliding window: {'✓ PASSED' if all_passed else '✗ FAILED'}")
-    return all_passed
-
-
-def run_core_tests():
-    """Run all core logic tests"""
-    print("CORE LOGIC TESTING")
-    print("=" * 50)
-    
-    tests = [
-        test_entity_patterns,
-        test_confidence_calibration,
-        test_entity_types,
-        test_text_processing,
-        test_entity_merging,
-        test_sliding_window,
-    ]
-    
-    results = []
-    for test in tests:
-        try:
-            result = test()
-            results.append(result)
-        except Exception as e:
-            print(f"✗ Test {test.__name__} failed with error: {e}")
-            results.append(False)
-    
-    print("\n" + "=" * 50)
-    print("CORE LOGIC TEST SUMMARY")
-    print("=" * 50)
-    
-    passed = sum(results)
-    total = len(results)
-    
-    print(f"Tests passed: {passed}/{total}")
-    
-    if passed == total:
-        print("🎉 All core logic tests PASSED!")
-        print("Core algorithms are working correctly.")
-    else:
-        print("⚠️  Some core logic tests failed.")
-        print("Core algorithms need attention.")
-    
-    print("\nWeeks 1-6 Implementation Status:")
-    print("✅ Week 1-2: Text Extraction Foundation")
-    print("✅ Week 3-4: BioBERT Model Setup") 
-    print("✅ Week 5-6: Advanced Medical Entity Recognition")
-    print("\nKey Features Implemented:")
-    print("• Multi-format document text extraction")
-    print("• BioBERT model management and optimization")
-    print("• Advanced NER with 8 entity types")
-    print("• Confidence calibration with temperature scaling")
-    print("• Negation and uncertainty detection")
-    print("• Entity linking and hierarchical recognition")
-    print("• Sliding window processing for long texts")
-    print("• API endpoints for document processing")
-    print("• Background processing with Celery")
-    
-    return passed == total
+    assert window_count_ok, "Expected more than one window"
+    assert overlap_ok, "Consecutive windows don't overlap"
 
 
 if __name__ == "__main__":
-    success = run_core_tests()
-    exit(0 if success else 1)
\ No newline at end of file
+    pytest.main([__file__, "-v"])
@@ -24,7 +24,11 @@ def main():
         if db_manager.connect():
             logger.info("Connected to terminology databases")
             print("Successfully connected to terminology databases.")
-            
+
+            # Check every database file is readable in one query
+            probe = db_manager.probe_all()
+            print(f"Readable databases: {', '.join(sorted(probe)) or 'none'}")
+
             # Get database statistics
             stats = db_manager.get_statistics()
             print(f"\nDatabase statistics:")
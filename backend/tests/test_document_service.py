@@ -0,0 +1,116 @@
+"""
+Tests for DocumentService upload validation and storage
+"""
+import asyncio
+import sqlite3
+
+import pytest
+
+document = pytest.importorskip("api.v1.models.document")
+DocumentType = document.DocumentType
+
+
+@pytest.fixture
+def fresh_service(tmp_path):
+    """A DocumentService of its own, for tests that close or lock its database"""
+    document_service = pytest.importorskip("api.v1.services.document_service")
+    service = document_service.DocumentService(
+        upload_dir=str(tmp_path / "uploads"),
+        db_path=str(tmp_path / "documents.db")
+    )
+    yield service
+    service.close()
+
+
+def test_validate_upload_rejects_unsupported_type(document_service):
+    """Test that an unknown document type is rejected"""
+    with pytest.raises(ValueError, match="Unsupported document type"):
+        document_service.validate_upload(b"test", "xml")
+
+
+def test_validate_upload_rejects_oversize_file(document_service):
+    """Test that a file over the type's size limit is rejected"""
+    limit = document_service.max_file_sizes[DocumentType.HL7]
+
+    document_service.validate_upload(b"x" * limit, DocumentType.HL7)
+    with pytest.raises(ValueError, match="exceeds maximum"):
+        document_service.validate_upload(b"x" * (limit + 1), DocumentType.HL7)
+
+
+@pytest.mark.parametrize("filename", ["notes.txt", "notes.md", "labs.csv", "notes"])
+def test_plain_text_upload_accepts_any_extension(document_service, filename):
+    """Test that plain text uploads aren't rejected for their filename extension"""
+    content = f"Patient note stored as {filename}".encode()
+
+    response = asyncio.run(document_service.save_document(
+        content=content,
+        filename=filename,
+        document_type=DocumentType.TXT
+    ))
+
+    assert response.filename == filename
+    assert response.document_type == DocumentType.TXT
+
+
+def test_get_db_commits_on_success(fresh_service):
+    """Test that a transaction is committed when the block finishes"""
+    with fresh_service._get_db() as conn:
+        conn.execute(
+            "INSERT INTO document_batches (batch_id, status, total_documents, created_at, updated_at) "
+            "VALUES ('committed', 'pending', 1, 'now', 'now')"
+        )
+
+    other = sqlite3.connect(fresh_service.db_path)
+    rows = other.execute("SELECT batch_id FROM document_batches").fetchall()
+    other.close()
+    assert rows == [("committed",)]
+
+
+def test_get_db_rolls_back_on_exception(fresh_service):
+    """Test that a transaction is rolled back when the block raises"""
+    with pytest.raises(RuntimeError):
+        with fresh_service._get_db() as conn:
+            conn.execute(
+                "INSERT INTO document_batches (batch_id, status, total_documents, created_at, updated_at) "
+                "VALUES ('rolled_back', 'pending', 1, 'now', 'now')"
+            )
+            raise RuntimeError("abort")
+
+    with fresh_service._get_db(write=False) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM document_batches").fetchone()[0] == 0
+
+
+def test_get_db_reads_without_write_lock(fresh_service):
+    """Test that a read-only transaction doesn't wait for another writer"""
+    with fresh_service._get_db(write=False) as conn:
+        # Fail at once instead of waiting out the busy timeout
+        conn.execute("PRAGMA busy_timeout = 0")
+
+    writer = sqlite3.connect(fresh_service.db_path, isolation_level=None)
+    writer.execute("BEGIN IMMEDIATE")
+    try:
+        with fresh_service._get_db(write=False) as conn:
+            assert conn.execute("SELECT COUNT(*) FROM documents").fetchone()[0] == 0
+        with pytest.raises(sqlite3.OperationalError, match="locked"):
+            with fresh_service._get_db():
+                pass
+    finally:
+        writer.execute("ROLLBACK")
+        writer.close()
+
+
+def test_close_and_reconnect(fresh_service):
+    """Test that close drops the shared connection and the next use reopens it"""
+    with fresh_service._get_db(write=False) as conn:
+        first = conn
+
+    fresh_service.close()
+    assert fresh_service._conn is None
+    with pytest.raises(sqlite3.ProgrammingError):
+        first.execute("SELECT 1")
+    fresh_service.close()
+
+    with fresh_service._get_db(write=False) as conn:
+        assert conn is not first
+        assert conn.execute("SELECT COUNT(*) FROM documents").fetchone()[0] == 0
+
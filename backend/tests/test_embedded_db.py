@@ -0,0 +1,161 @@
+"""
+Tests for the embedded terminology database manager
+"""
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from app.standards.terminology.embedded_db import EmbeddedDatabaseManager
+
+SAMPLE_DATA_DIR = Path(__file__).resolve().parents[1] / "data" / "terminology" / "sample_data"
+
+
+def _make_database(data_dir, system, tables=1):
+    """Create a minimal {system}_core.sqlite with the given number of tables"""
+    conn = sqlite3.connect(data_dir / f"{system}_core.sqlite")
+    for i in range(tables):
+        conn.execute(f"CREATE TABLE t{i} (x)")
+    conn.commit()
+    conn.close()
+
+
+def test_probe_all_skips_missing_databases(tmp_path):
+    """Test that systems without a database file are left out"""
+    _make_database(tmp_path, "snomed", tables=2)
+
+    assert EmbeddedDatabaseManager(str(tmp_path)).probe_all() == {"snomed": 2}
+
+
+def test_probe_all_no_databases(tmp_path):
+    """Test that probing an empty data directory finds nothing"""
+    assert EmbeddedDatabaseManager(str(tmp_path)).probe_all() == {}
+
+
+def test_probe_all_subset_of_systems(tmp_path):
+    """Test that only the requested systems are probed"""
+    for system in ("snomed", "loinc", "rxnorm"):
+        _make_database(tmp_path, system)
+
+    assert EmbeddedDatabaseManager(str(tmp_path)).probe_all(["loinc"]) == {"loinc": 1}
+
+
+@pytest.mark.parametrize("dirname", ["terms?v=1", "terms#1", "terms%20"])
+def test_probe_all_special_characters_in_path(tmp_path, dirname):
+    """Test that URI-reserved characters in the data path are escaped"""
+    data_dir = tmp_path / dirname
+    data_dir.mkdir()
+    _make_database(data_dir, "rxnorm")
+
+    assert EmbeddedDatabaseManager(str(data_dir)).probe_all() == {"rxnorm": 1}
+
+
+@pytest.mark.parametrize("system", ["icd10", "snomed; DROP TABLE t0", "main"])
+def test_probe_all_rejects_unknown_systems(tmp_path, system):
+    """Test that system names outside db_files never reach the SQL"""
+    _make_database(tmp_path, "snomed")
+
+    with pytest.raises(ValueError, match="Unknown terminology systems"):
+        EmbeddedDatabaseManager(str(tmp_path)).probe_all(["snomed", system])
+
+
+def test_probe_all_attaches_read_only(tmp_path, monkeypatch):
+    """Test that the database files are attached read-only"""
+    _make_database(tmp_path, "snomed")
+    write_errors = []
+    real_connect = sqlite3.connect
+
+    class CheckingConnection(sqlite3.Connection):
+        def close(self):
+            # Try to write through the attachment before it is dropped
+            try:
+                self.execute("CREATE TABLE snomed.probe_write (x)")
+            except sqlite3.OperationalError as e:
+                write_errors.append(str(e))
+            super().close()
+
+    monkeypatch.setattr(
+        sqlite3, "connect",
+        lambda *args, **kwargs: real_connect(*args, factory=CheckingConnection, **kwargs)
+    )
+    result = EmbeddedDatabaseManager(str(tmp_path)).probe_all()
+
+    assert result == {"snomed": 1}
+    assert len(write_errors) == 1 and "readonly" in write_errors[0]
+
+
+def _lookup_indexes(db_path):
+    conn = sqlite3.connect(db_path)
+    names = {row[0] for row in conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'index' AND name LIKE '%_lower'"
+    )}
+    conn.close()
+    return names
+
+
+def test_connect_does_not_write_database_files(tmp_path):
+    """Test that connecting to an existing database leaves the file untouched"""
+    db_path = tmp_path / "snomed_core.sqlite"
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE snomed_concepts (code TEXT, term TEXT, display TEXT)")
+    conn.commit()
+    conn.close()
+    before = db_path.read_bytes()
+
+    manager = EmbeddedDatabaseManager(str(tmp_path))
+    assert manager.connect()
+    manager.close()
+
+    assert db_path.read_bytes() == before
+    assert _lookup_indexes(db_path) == set()
+
+
+def test_lookup_indexes_built_with_database(tmp_path):
+    """Test that new databases and build_lookup_indexes add the LOWER() indexes"""
+    manager = EmbeddedDatabaseManager(str(tmp_path))
+    assert manager.connect()
+    manager.close()
+    assert _lookup_indexes(tmp_path / "loinc_core.sqlite") == {
+        "idx_loinc_concepts_term_lower", "idx_loinc_concepts_component_lower"
+    }
+
+    db_path = tmp_path / "snomed_core.sqlite"
+    conn = sqlite3.connect(db_path)
+    conn.execute("DROP INDEX idx_snomed_concepts_term_lower")
+    conn.commit()
+    conn.close()
+
+    manager = EmbeddedDatabaseManager(str(tmp_path))
+    assert manager.connect()
+    manager.build_lookup_indexes()
+    manager.close()
+    assert _lookup_indexes(db_path) == {"idx_snomed_concepts_term_lower"}
+
+
+def test_import_concepts_builds_lookup_indexes(tmp_path):
+    """Test that loading concepts adds the rows and the LOWER() indexes"""
+    manager = EmbeddedDatabaseManager(str(tmp_path))
+    assert manager.connect()
+    conn = manager.connections["rxnorm"]
+    for column in ("term", "ingredient", "brand_name"):
+        conn.execute(f"DROP INDEX idx_rxnorm_concepts_{column}_lower")
+    conn.commit()
+
+    imported = manager.import_concepts("rxnorm", str(SAMPLE_DATA_DIR / "rxnorm_sample.csv"))
+    lookup = manager.lookup_rxnorm("metformin")
+    manager.close()
+
+    assert imported == 25
+    assert lookup["code"] == "6809"
+    assert _lookup_indexes(tmp_path / "rxnorm_core.sqlite") == {
+        "idx_rxnorm_concepts_term_lower",
+        "idx_rxnorm_concepts_ingredient_lower",
+        "idx_rxnorm_concepts_brand_name_lower",
+    }
+
+
+def test_import_concepts_unknown_system(tmp_path):
+    """Test that importing into a system with no database imports nothing"""
+    manager = EmbeddedDatabaseManager(str(tmp_path))
+
+    assert manager.import_concepts("snomed", str(SAMPLE_DATA_DIR / "snomed_sample.csv")) == 0
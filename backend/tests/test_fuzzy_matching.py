@@ -147,6 +147,20 @@ class TestFuzzyMatcher(unittest.TestCase):
         variations = self.fuzzy_matcher._generate_term_variations('myocardial infarction')
         self.assertIn('mi', [v.lower() for v in variations])
 
+    def test_variations_are_memoized(self):
+        """Test that variations are cached and refreshed when synonyms change."""
+        first = self.fuzzy_matcher._generate_term_variations('cholesterol')
+        second = self.fuzzy_matcher._generate_term_variations('cholesterol')
+        
+        self.assertEqual(first, second)
+        self.assertIsNot(first, second)
+        self.assertEqual(self.fuzzy_matcher._variations_cached.cache_info().hits, 1)
+        self.assertNotIn('lipids', second)
+        
+        # Adding synonyms must invalidate the cached variations
+        self.fuzzy_matcher.add_synonym('cholesterol', ['lipids'])
+        self.assertIn('lipids', self.fuzzy_matcher._generate_term_variations('cholesterol'))
+
     def test_exact_matching(self):
         """Test exact term matching."""
         # Test direct match
@@ -171,6 +185,14 @@ class TestFuzzyMatcher(unittest.TestCase):
         self.assertIsNotNone(result)
         self.assertEqual(result['code'], '123')
         self.assertEqual(result['display'], 'Hypertension')
+    
+    def test_exact_match_skips_variations(self):
+        """Test that an indexed term is matched without generating variations."""
+        with patch.object(self.fuzzy_matcher, '_generate_term_variations') as mock_variations:
+            result = self.fuzzy_matcher.find_fuzzy_match('Asthma', 'snomed')
+        
+        mock_variations.assert_not_called()
+        self.assertEqual(result['code'], '125')
 
     def test_rapidfuzz_matching(self):
         """Test fuzzy matching with RapidFuzz."""
@@ -194,6 +216,49 @@ class TestFuzzyMatcher(unittest.TestCase):
                 # Ensure the RapidFuzz match was called
                 mock_rapidfuzz.assert_called_once()
 
+    def test_batch_matching(self):
+        """Test that batch matching agrees with per-term matching."""
+        terms = ['hypertension', 'HTN', 'hypertenshion', 'asthmaa', 'unrelated term', '']
+        
+        results = self.fuzzy_matcher.find_fuzzy_matches(terms, 'snomed')
+        
+        self.assertEqual(len(results), len(terms))
+        self.assertIsNone(results[-1])
+        for term, result in zip(terms[:-1], results):
+            self.assertEqual(result, self.fuzzy_matcher.find_fuzzy_match(term, 'snomed'))
+
+    def test_ratio_candidates_length_filter(self):
+        """Test that candidates too long or short for the ratio cutoff are skipped."""
+        candidates = self.fuzzy_matcher._ratio_candidates('astma', 'snomed')
+        
+        self.assertIn('asthma', candidates)
+        self.assertNotIn('myocardial infarction', candidates)
+        self.assertNotIn('htn', candidates)
+        
+        # Changing the index and clearing the cache rebuilds the buckets
+        self.fuzzy_matcher.term_index['snomed']['astmas'] = {'code': '125', 'display': 'Asthma'}
+        self.fuzzy_matcher.clear_cache()
+        self.assertIn('astmas', self.fuzzy_matcher._ratio_candidates('astma', 'snomed'))
+
+    def test_candidates_follow_rebuilt_index(self):
+        """Test that rebuilding or clearing the index never leaves stale candidates."""
+        self.assertIn('asthma', self.fuzzy_matcher._get_candidates('snomed')['terms'])
+        
+        # Same size, different terms: only explicit invalidation can catch this
+        index = self.fuzzy_matcher.term_index['snomed']
+        index['asthmatic'] = index.pop('asthma')
+        self.fuzzy_matcher.clear_cache()
+        terms = self.fuzzy_matcher._get_candidates('snomed')['terms']
+        self.assertIn('asthmatic', terms)
+        self.assertNotIn('asthma', terms)
+        
+        # Rebuilding from the database drops the cached candidates as well
+        self.fuzzy_matcher.term_index['snomed'] = {}
+        self.assertTrue(self.fuzzy_matcher._build_index('snomed'))
+        terms = self.fuzzy_matcher._get_candidates('snomed')['terms']
+        self.assertEqual(set(terms), set(self.fuzzy_matcher.term_index['snomed']))
+        self.assertNotIn('asthmatic', terms)
+
     def test_basic_fuzzy_matching(self):
         """Test basic fuzzy matching (without RapidFuzz)."""
         # Use mock to simulate RapidFuzz being unavailable
@@ -4,13 +4,6 @@ Tests a wide range of laboratory tests, observations, and measurements.
 """
 
 import pytest
-from app.standards.terminology.mapper import TerminologyMapper
-
-
-@pytest.fixture
-def mapper():
-    """Create a mapper instance for testing."""
-    return TerminologyMapper()
 
 
 class TestLOINCBloodChemistry:
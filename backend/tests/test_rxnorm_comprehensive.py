@@ -4,13 +4,6 @@ Tests a wide range of medications including brand names, generic names, and vari
 """
 
 import pytest
-from app.standards.terminology.mapper import TerminologyMapper
-
-
-@pytest.fixture
-def mapper():
-    """Create a mapper instance for testing."""
-    return TerminologyMapper()
 
 
 class TestRxNormAntibiotics:
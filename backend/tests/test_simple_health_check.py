@@ -5,133 +5,60 @@ Simple Health Check Test
 Tests only the most basic functionality to ensure the system is working.
 """
 
-import os
-import sys
+import importlib.util
 
-# Add parent directory to path
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import pytest
+
+CORE_MODULES = (
+    "app.standards.terminology.mapper",
+    "api.v1.models.document",
+    "api.v1.models.document_batch",
+)
 
 def test_basic_imports():
-    """Test basic imports work"""
-    print("Testing basic imports...")
-    
-    try:
-        from app.standards.terminology.mapper import TerminologyMapper
-        print("✓ TerminologyMapper imported")
-        
-        from api.v1.models.document import DocumentType, DocumentStatus
-        print("✓ Document models imported")
-        
-        from api.v1.models.document_batch import BatchUploadStatus
-        print("✓ Batch models imported")
-        
-        return True
-    except Exception as e:
-        print(f"❌ Import failed: {e}")
-        return False
+    """Test that the core modules can be found without executing them"""
+    for module_name in CORE_MODULES:
+        try:
+            spec = importlib.util.find_spec(module_name)
+        except ModuleNotFoundError as e:
+            # Locating a submodule imports its parent packages, which may
+            # need third-party packages that aren't installed
+            if e.name.split(".")[0] in ("app", "api"):
+                raise
+            pytest.skip(f"Dependency of {module_name} not installed: {e.name}")
+        assert spec is not None, f"{module_name} not found"
 
-def test_terminology_mapping():
-    """Test basic terminology mapping"""
-    print("\nTesting terminology mapping...")
-    
-    try:
-        from app.standards.terminology.mapper import TerminologyMapper
-        
-        mapper = TerminologyMapper()
-        print("✓ TerminologyMapper created")
-        
-        # Test a simple mapping
-        results = mapper.map_term("diabetes")
-        if results:
-            print(f"✓ Found {len(results)} results for 'diabetes'")
-            if len(results) > 0:
-                print(f"  First result: {results[0].get('display', 'N/A')}")
-        else:
-            print("⚠️  No results for diabetes (possibly empty database)")
-        
-        return True
-    except Exception as e:
-        print(f"❌ Terminology mapping failed: {e}")
-        return False
+def test_terminology_mapping(mapper):
+    """Test basic terminology mapping against the sample SNOMED data"""
+    # The mapper fixture loads data/terminology/sample_data into its databases
+    result = mapper.map_term("diabetes mellitus", system="snomed")
+    assert result["found"]
+    assert result["match_type"] == "exact"
+    assert result["code"] == "73211009"
+    assert result["system"] == "http://snomed.info/sct"
 
 def test_document_models():
     """Test document models work"""
-    print("\nTesting document models...")
+    document = pytest.importorskip("api.v1.models.document")
+    document_batch = pytest.importorskip("api.v1.models.document_batch")
     
-    try:
-        from api.v1.models.document import DocumentType, DocumentStatus
-        from api.v1.models.document_batch import BatchUploadStatus
-        from uuid import uuid4
-        from datetime import datetime, timezone
-        
-        # Test enum values
-        assert DocumentType.TXT == "txt"
-        assert DocumentStatus.PENDING == "pending"
-        assert BatchUploadStatus.COMPLETED == "completed"
-        print("✓ Model enums working")
-        
-        return True
-    except Exception as e:
-        print(f"❌ Document models failed: {e}")
-        return False
+    assert document.DocumentType.TXT == "txt"
+    assert document.DocumentStatus.PENDING == "pending"
+    assert document_batch.BatchUploadStatus.COMPLETED == "completed"
 
 def test_basic_text_processing():
     """Test basic text processing capabilities"""
-    print("\nTesting text processing...")
-    
-    try:
-        # Test basic string operations that would be used in the system
-        medical_text = "Patient has diabetes mellitus and takes metformin 500mg twice daily."
-        
-        # Basic text cleaning
-        cleaned = medical_text.lower().strip()
-        assert len(cleaned) > 0
-        
-        # Basic tokenization
-        words = cleaned.split()
-        assert "diabetes" in words
-        assert "metformin" in words
-        
-        print("✓ Basic text processing works")
-        return True
-    except Exception as e:
-        print(f"❌ Text processing failed: {e}")
-        return False
-
-def main():
-    """Run simple health checks"""
-    print("=" * 60)
-    print("SIMPLE HEALTH CHECK")
-    print("=" * 60)
-    
-    tests = [
-        test_basic_imports,
-        test_document_models,
-        test_basic_text_processing,
-        test_terminology_mapping,
-    ]
-    
-    passed = 0
-    for test in tests:
-        try:
-            if test():
-                passed += 1
-        except Exception as e:
-            print(f"❌ Test failed with exception: {e}")
-    
-    print("\n" + "=" * 60)
-    print(f"RESULTS: {passed}/{len(tests)} tests passed")
+    medical_text = "  Patient has diabetes mellitus and takes metformin 500mg twice daily. "
     
-    if passed == len(tests):
-        print("✅ ALL TESTS PASSED - System is healthy!")
-    elif passed >= len(tests) * 0.75:
-        print("⚠️  MOSTLY WORKING - Minor issues detected")
-    else:
-        print("❌ SYSTEM ISSUES - Multiple failures detected")
+    # Basic text cleaning
+    cleaned = medical_text.lower().strip()
+    assert cleaned == "patient has diabetes mellitus and takes metformin 500mg twice daily."
     
-    print("=" * 60)
-    return passed == len(tests)
+    # Basic tokenization
+    words = cleaned.split()
+    assert len(words) == 10
+    assert words[2:4] == ["diabetes", "mellitus"]
+    assert words[6] == "metformin"
 
 if __name__ == "__main__":
-    success = main()
-    sys.exit(0 if success else 1)
\ No newline at end of file
+    pytest.main([__file__, "-v"])
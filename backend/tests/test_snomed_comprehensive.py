@@ -3,14 +3,9 @@ Comprehensive tests for SNOMED CT term mapping capabilities.
 Tests a wide range of medical conditions, symptoms, and findings.
 """
 
-import pytest
-from app.standards.terminology.mapper import TerminologyMapper
-
+from types import SimpleNamespace
 
-@pytest.fixture
-def mapper():
-    """Create a mapper instance for testing."""
-    return TerminologyMapper()
+import pytest
 
 
 class TestSNOMEDConditions:
@@ -300,36 +295,50 @@ class TestSNOMEDAnatomicalStructures:
 class TestSNOMEDFuzzyMatching:
     """Test fuzzy matching capabilities for SNOMED terms."""
     
-    def test_misspellings(self, mapper):
+    @pytest.mark.parametrize("misspelled,expected_code", [
+        ("diabetis", "73211009"),  # diabetes
+        ("hypertenshun", "38341003"),  # hypertension
+        ("noomonia", "233604007"),  # pneumonia
+        ("astma", "195967001"),  # asthma
+        ("epilepsi", "84757009"),  # epilepsy
+    ])
+    def test_misspellings(self, mapper, misspelled, expected_code):
         """Test handling of common misspellings."""
-        test_cases = [
-            ("diabetis", "73211009"),  # diabetes
-            ("hypertenshun", "38341003"),  # hypertension
-            ("noomonia", "233604007"),  # pneumonia
-            ("astma", "195967001"),  # asthma
-            ("epilepsi", "84757009"),  # epilepsy
-        ]
-        
-        for misspelled, expected_code in test_cases:
-            result = mapper.map_term(misspelled, system="snomed")
-            assert result is not None, f"Failed to map misspelling: {misspelled}"
-            assert result["code"] == expected_code, f"Wrong code for {misspelled}: got {result['code']}, expected {expected_code}"
-            assert result["confidence"] >= 0.6, f"Confidence too low for {misspelled}: {result['confidence']}"
+        result = mapper.map_term(misspelled, system="snomed")
+        assert result is not None, f"Failed to map misspelling: {misspelled}"
+        assert result["code"] == expected_code, f"Wrong code for {misspelled}: got {result['code']}, expected {expected_code}"
+        assert result["confidence"] >= 0.6, f"Confidence too low for {misspelled}: {result['confidence']}"
     
-    def test_abbreviation_expansion(self, mapper):
+    @pytest.mark.parametrize("abbrev,expected_code", [
+        ("DM", "73211009"),  # diabetes mellitus
+        ("HTN", "38341003"),  # hypertension
+        ("CAD", "53741008"),  # coronary artery disease
+        ("CHF", "42343007"),  # congestive heart failure
+        ("COPD", "13645005"),  # chronic obstructive pulmonary disease
+    ])
+    def test_abbreviation_expansion(self, mapper, abbrev, expected_code):
         """Test abbreviation expansion."""
-        test_cases = [
-            ("DM", "73211009"),  # diabetes mellitus
-            ("HTN", "38341003"),  # hypertension
-            ("CAD", "53741008"),  # coronary artery disease
-            ("CHF", "42343007"),  # congestive heart failure
-            ("COPD", "13645005"),  # chronic obstructive pulmonary disease
-        ]
+        result = mapper.map_term(abbrev, system="snomed")
+        assert result is not None, f"Failed to map abbreviation: {abbrev}"
+        assert result["code"] == expected_code, f"Wrong code for {abbrev}: got {result['code']}, expected {expected_code}"
+    
+    @pytest.mark.parametrize("variant", ["DIABETES", "Diabetes", "  diabetes  ", "DiAbEtEs"])
+    def test_case_insensitivity(self, mapper, variant):
+        """Test that case and surrounding whitespace don't affect normalization."""
+        assert mapper.normalize_term(variant) == mapper.normalize_term("diabetes")
+    
+    def test_case_insensitive_mapping(self, mapper):
+        """Test that differently cased terms map to the same concept."""
+        # Clear between lookups so the second one isn't a cache hit
+        mapper.clear_cache()
+        upper = mapper.map_term("DIABETES", system="snomed")
+        mapper.clear_cache()
+        lower = mapper.map_term("diabetes", system="snomed")
         
-        for abbrev, expected_code in test_cases:
-            result = mapper.map_term(abbrev, system="snomed")
-            assert result is not None, f"Failed to map abbreviation: {abbrev}"
-            assert result["code"] == expected_code, f"Wrong code for {abbrev}: got {result['code']}, expected {expected_code}"
+        assert mapper._map_term_cached.cache_info().misses == 1
+        assert upper["code"] == lower["code"]
+        # map_term normalizes case itself, so also check the lookup below it
+        assert mapper.map_to_snomed("DIABETES")["code"] == mapper.map_to_snomed("diabetes")["code"]
 
 
 class TestSNOMEDContextAwareMapping:
@@ -346,18 +355,95 @@ class TestSNOMEDContextAwareMapping:
         if result_no_context:
             assert result_with_context["confidence"] > result_no_context["confidence"]
     
-    def test_negation_handling(self, mapper):
+    @pytest.mark.parametrize("term,expected_code,max_confidence", [
+        ("no fever", "386661006", 0.3),  # Should have low confidence due to negation
+        ("denies chest pain", "29857009", 0.3),
+        ("without cough", "49727002", 0.3),
+    ])
+    def test_negation_handling(self, mapper, term, expected_code, max_confidence):
         """Test handling of negated terms."""
-        test_cases = [
-            ("no fever", "386661006", 0.3),  # Should have low confidence due to negation
-            ("denies chest pain", "29857009", 0.3),
-            ("without cough", "49727002", 0.3),
-        ]
+        result = mapper.map_term(term, system="snomed")
+        if result:
+            assert result["confidence"] <= max_confidence, f"Confidence too high for negated term {term}: {result['confidence']}"
+
+
+class TestSNOMEDMappingCache:
+    """Test memoization of repeated map_term lookups."""
+    
+    def test_repeated_lookup_hits_cache(self, mapper):
+        """Test that identical lookups are served from the cache."""
+        mapper.clear_cache()
+        first = mapper.map_term("Diabetes", system="snomed")
+        first["code"] = "mutated"
+        second = mapper.map_term("  diabetes ", system="SNOMED")
         
-        for term, expected_code, max_confidence in test_cases:
-            result = mapper.map_term(term, system="snomed")
-            if result:
-                assert result["confidence"] <= max_confidence, f"Confidence too high for negated term {term}: {result['confidence']}"
+        info = mapper._map_term_cached.cache_info()
+        assert info.hits == 1
+        assert info.misses == 1
+        assert second["code"] != "mutated"
+        if not second["found"]:
+            assert second["display"] == "  diabetes "
+
+    def test_cached_result_echoes_caller_term(self, mapper, monkeypatch):
+        """Test that echoed input fields keep the caller's spelling."""
+        monkeypatch.setattr(mapper, "abbreviations", {"htn": ["hypertension"]})
+        monkeypatch.setattr(
+            mapper.db_manager, "lookup_snomed",
+            lambda term: {"code": "38341003", "display": "Hypertension"} if term == "hypertension" else None
+        )
+        mapper.clear_cache()
+        try:
+            upper = mapper.map_term("HTN", system="snomed")
+            lower = mapper.map_term("htn", system="snomed")
+            hits = mapper._map_term_cached.cache_info().hits
+        finally:
+            mapper.clear_cache()
+
+        assert hits == 1
+        assert upper["code"] == lower["code"] == "38341003"
+        assert upper["original_term"] == "HTN"
+        assert lower["original_term"] == "htn"
+
+    def test_empty_context_shares_cache_entry(self, mapper):
+        """Test that an empty context is cached like no context."""
+        mapper.clear_cache()
+        mapper.map_term("asthma", system="snomed")
+        mapper.map_term("asthma", system="snomed", context="")
+        
+        assert mapper._map_term_cached.cache_info().hits == 1
+    
+    def test_map_terms_deduplicates_pairs(self, mapper):
+        """Test that batch mapping looks up each distinct pair once."""
+        mapper.clear_cache()
+        pairs = [("diabetes", "snomed"), ("hypertension", "snomed"), ("diabetes", "snomed")]
+        results = mapper.map_terms(pairs)
+        
+        assert set(results) == {("diabetes", "snomed"), ("hypertension", "snomed")}
+        assert mapper._map_term_cached.cache_info().misses == 2
+    
+    def test_external_api_lookups_not_cached(self, mapper, monkeypatch):
+        """Test that a lookup made during an API outage isn't served again later."""
+        calls = []
+        
+        def search_rxnorm(term, max_results=1):
+            calls.append(term)
+            if len(calls) == 1:
+                raise ConnectionError("RxNorm API unavailable")
+            return [{"code": "6809", "display": "metformin", "tty": "IN"}]
+        
+        monkeypatch.setattr(mapper, "external_service", SimpleNamespace(search_rxnorm=search_rxnorm))
+        mapper.clear_cache()
+        try:
+            during_outage = mapper.map_term("metformin", system="rxnorm")
+            after_outage = mapper.map_term("metformin", system="rxnorm")
+            info = mapper._map_term_cached.cache_info()
+        finally:
+            mapper.clear_cache()
+        
+        assert len(calls) == 2
+        assert during_outage.get("match_type") != "api"
+        assert after_outage["match_type"] == "api"
+        assert info.currsize == 0
 
 
 if __name__ == "__main__":